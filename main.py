@@ -6,8 +6,9 @@ from typing_extensions import Annotated
 
 from src.config import OCREngine
 from src.utils.logging import setup_logging
-from src.workflows.gps_extraction import run_gps_extraction_workflow
-from src.workflows.kmz_generation import run_kmz_generation_workflow
+
+# The workflows are imported inside their commands: they pull in pandas, Pillow,
+# OpenCV and the OCR engines, which `--help` and the other command never need.
 
 # --- Setup Typer App and Logging ---
 app = typer.Typer(
@@ -105,10 +106,20 @@ def gps_extract_command(
             is_flag=True,
         ),
     ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Ignore results cached by earlier runs and re-read every image.",
+            is_flag=True,
+        ),
+    ] = False,
 ):
     """
     Extracts EXIF metadata from images, with powerful, configurable OCR fallback.
     """
+    from src.workflows.gps_extraction import run_gps_extraction_workflow
+
     logger = ctx.obj
     logger.info("Invoking GPS Extraction command.")
     run_gps_extraction_workflow(
@@ -123,6 +134,7 @@ def gps_extract_command(
         no_ocr_on_invalid_gps=no_ocr_on_invalid_gps,
         preprocess_method=preprocess_method,
         save_preprocessed=save_preprocessed,
+        use_cache=not no_cache,
     )
 
 
@@ -144,6 +156,8 @@ def kmz_generate_command(
     ] = None,
 ):
     """Generates a KMZ file from a CSV or Excel file."""
+    from src.workflows.kmz_generation import run_kmz_generation_workflow
+
     logger = ctx.obj
     logger.info("Invoking KMZ Generation command.")
     run_kmz_generation_workflow(
@@ -1,7 +1,9 @@
 # src/config.py
+import os
 from enum import Enum
+from typing import Optional
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class AppConfig(BaseSettings):
@@ -10,6 +12,9 @@ class AppConfig(BaseSettings):
     User-facing settings are now handled by .toml configuration files.
     """
 
+    # Treat an empty environment variable as unset.
+    model_config = SettingsConfigDict(env_ignore_empty=True)
+
     # --- Internal Folder Names ---
     PHOTO_FOLDER_NAME: str = "photo_files"
     ICON_FOLDER_NAME: str = "icon_files"
@@ -18,6 +23,14 @@ class AppConfig(BaseSettings):
     IMAGE_EXTENSIONS: tuple[str, ...] = (".png", ".jpg", ".jpeg")
     LOG_FILE_NAME: str = "status.log"
     REQUESTS_USER_AGENT: str = "Geo-Photo-Toolkit/1.0"
+    # Where results are cached between runs.
+    CACHE_DIR: str = os.path.join(
+        os.path.expanduser("~"), ".cache", "geo-photo-toolkit"
+    )
+
+    # --- Environment Overrides ---
+    # Force EasyOCR onto the GPU (1) or CPU (0); auto-detected when unset.
+    GEOPHOTO_EASYOCR_GPU: Optional[bool] = None
 
 
 # Instantiate the config for easy import across the app
@@ -1,34 +1,129 @@
 # src/core/exif.py
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
 from PIL import Image
 from PIL.ExifTags import GPSTAGS, TAGS
 
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
+# JPEG and PNG files carry their EXIF block in a single, well-known location, so
+# we can read it directly instead of letting Pillow parse the whole image header.
+_JPEG_EXTENSIONS = (".jpg", ".jpeg")
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_EXIF_HEADER = b"Exif\x00\x00"
+
+# Tags whose values are returned as raw (degrees, minutes, seconds, direction)
+# quadruples; see `convert_dms_to_dd`.
+GPS_COORDINATE_TAGS = ("GPSLatitude", "GPSLongitude")
+_DMS_WEIGHTS = np.array([1.0, 1 / 60, 1 / 3600])
+
+# (friendly_name, exif_tag_name) pairs, in output column order.
+ExifSchema = Tuple[Tuple[str, str], ...]
+
+# Reverse lookups from tag name to numeric ID(s). A few names appear under more
+# than one ID, so each maps to a tuple.
+_TAG_IDS: Dict[str, Tuple[int, ...]] = {}
+for _tag_id, _tag_name in TAGS.items():
+    _TAG_IDS[_tag_name] = _TAG_IDS.get(_tag_name, ()) + (_tag_id,)
+_GPS_TAG_IDS = {tag_name: tag_id for tag_id, tag_name in GPSTAGS.items()}
+# The GPS tags `extract_exif_data` can return. If none is requested, the GPS
+# IFD is not read at all.
+_GPS_OUTPUT_TAGS = frozenset((*GPS_COORDINATE_TAGS, "GPSAltitude"))
+# Every tag needed to produce signed GPS coordinates.
+_GPS_COORDINATE_TAG_IDS = frozenset(
+    _GPS_TAG_IDS[tag_name]
+    for tag_name in (*GPS_COORDINATE_TAGS, "GPSLatitudeRef", "GPSLongitudeRef")
+)
+
 # --- Helper Functions ---
 
 
+def _read_app1_bytes(image_path: str) -> Optional[bytes]:
+    """
+    Walks the JPEG marker segments and returns the EXIF (TIFF) blob stored in the
+    APP1 segment, without decoding any image data.
+    """
+    with open(image_path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            raise ValueError("Not a JPEG file (missing SOI marker)")
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            # Start of scan / end of image: no metadata segments follow.
+            if marker[1] in (0xDA, 0xD9):
+                return None
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            segment_length = int.from_bytes(length_bytes, "big") - 2
+            if marker[1] == 0xE1:
+                payload = f.read(segment_length)
+                # APP1 is also used for XMP, so keep looking if this isn't EXIF.
+                if payload.startswith(_EXIF_HEADER):
+                    return payload[len(_EXIF_HEADER) :]
+            else:
+                f.seek(segment_length, os.SEEK_CUR)
+
+
+def _read_png_exif_bytes(image_path: str) -> Optional[bytes]:
+    """Iterates the PNG chunks and returns the payload of the 'eXIf' chunk."""
+    with open(image_path, "rb") as f:
+        if f.read(8) != _PNG_SIGNATURE:
+            raise ValueError("Not a PNG file (invalid signature)")
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_length = int.from_bytes(chunk_header[:4], "big")
+            chunk_type = chunk_header[4:]
+            if chunk_type == b"eXIf":
+                return f.read(chunk_length)
+            if chunk_type == b"IEND":
+                return None
+            # Skip the chunk data and its trailing CRC.
+            f.seek(chunk_length + 4, os.SEEK_CUR)
+
+
 def _get_exif_data(image_path: str) -> Optional[Image.Exif]:
-    """Opens an image and extracts its raw EXIF data object."""
+    """
+    Extracts the raw EXIF data object of an image. JPEG and PNG files are read
+    directly from their metadata segment; other formats fall back to Pillow.
+    """
     try:
-        with Image.open(image_path) as img:
-            exif_data = img.getexif()
-            if not exif_data:
-                logger.warning(f"No EXIF data found in {image_path}")
-                return None
-            return exif_data
+        extension = os.path.splitext(image_path)[1].lower()
+        exif_data = Image.Exif()
+        if extension in _JPEG_EXTENSIONS:
+            exif_data.load(_read_app1_bytes(image_path))
+        elif extension == ".png":
+            exif_data.load(_read_png_exif_bytes(image_path))
+        else:
+            with Image.open(image_path) as img:
+                exif_data = img.getexif()
+        if not exif_data:
+            logger.warning(f"No EXIF data found in {image_path}")
+            return None
+        return exif_data
     except Exception as e:
         logger.error(f"Could not open or read image file at {image_path}: {e}")
         return None
 
 
-def _decode_ifd(ifd, tag_map: Dict[int, str]) -> Dict[str, Any]:
-    """Decodes an IFD from numeric tags to human-readable names."""
+def _decode_ifd(
+    ifd, tag_map: Dict[int, str], needed_ids: FrozenSet[int]
+) -> Dict[str, Any]:
+    """
+    Decodes the requested tags of an IFD from numeric tags to human-readable
+    names. Only the tags in `needed_ids` are looked up and decoded.
+    """
     decoded_data = {}
-    for key, val in ifd.items():
+    for key in needed_ids:
+        val = ifd.get(key)
+        if val is None:
+            continue
         tag_name = tag_map.get(key, key)
         # Clean up byte strings for cleaner output
         if isinstance(val, bytes):
@@ -43,81 +138,140 @@ def _decode_ifd(ifd, tag_map: Dict[int, str]) -> Dict[str, Any]:
     return decoded_data
 
 
-def _convert_dms_to_dd(degrees, minutes, seconds, direction):
-    """Converts a GPS coordinate from DMS to DD format."""
-    dd = float(degrees) + float(minutes) / 60 + float(seconds) / 3600
-    if direction in ["S", "W"]:
-        dd *= -1
-    return dd
+def build_exif_schema(tags_to_extract: Mapping[str, str]) -> ExifSchema:
+    """
+    Freezes the `[extract.columns]` config table into the positional schema
+    used by `extract_exif_data`. Build this once per run rather than once per
+    image.
+    """
+    return tuple(tags_to_extract.items())
 
 
-# --- Main Extraction Logic ---
+def build_needed_tag_ids(schema: ExifSchema) -> FrozenSet[int]:
+    """
+    Converts the EXIF tag names in the schema into the numeric tag IDs that
+    `extract_exif_data` has to decode. Build this once per run rather than
+    once per image.
+    """
+    needed_ids = set()
+    for _, exif_tag_name in schema:
+        if exif_tag_name in GPS_COORDINATE_TAGS:
+            # Both coordinates and their hemisphere references are needed.
+            needed_ids.update(_GPS_COORDINATE_TAG_IDS)
+        elif exif_tag_name in _GPS_TAG_IDS:
+            needed_ids.add(_GPS_TAG_IDS[exif_tag_name])
+        else:
+            needed_ids.update(_TAG_IDS.get(exif_tag_name, ()))
+    return frozenset(needed_ids)
 
 
-def extract_exif_data(
-    image_path: str, tags_to_extract: Dict[str, str]
-) -> Optional[Dict[str, Any]]:
-    """
-    Extracts specific, user-defined EXIF tags from an image file,
-    searching across all relevant IFDs (Image File Directories).
+def convert_dms_to_dd(
+    dms_values: Sequence[Tuple[float, float, float, Optional[str]]],
+) -> np.ndarray:
     """
-    raw_exif = _get_exif_data(image_path)
-    if not raw_exif:
-        return None
+    Converts a batch of GPS coordinates from DMS to DD format in one vectorized
+    pass.
 
-    # --- THE CORE FIX IS HERE ---
-    # 1. Decode the main IFD (top-level tags)
-    all_decoded_data = _decode_ifd(raw_exif, TAGS)
+    Args:
+        dms_values: (degrees, minutes, seconds, direction) quadruples, as returned
+            by `extract_exif_data` for the GPSLatitude/GPSLongitude tags.
 
-    # 2. Decode the nested Exif IFD (detailed photo settings)
-    #    The numeric ID 34665 is the standard pointer to the Exif sub-directory.
-    exif_ifd = raw_exif.get_ifd(34665)
-    all_decoded_data.update(_decode_ifd(exif_ifd, TAGS))
+    Returns:
+        np.ndarray: The coordinates in decimal degrees, in input order.
+    """
+    if not dms_values:
+        return np.empty(0, dtype=np.float64)
+    dms = np.asarray([value[:3] for value in dms_values], dtype=np.float64)
+    directions = np.asarray([value[3] or "" for value in dms_values])
+    dd = dms @ _DMS_WEIGHTS
+    dd[np.isin(directions, ["S", "W"])] *= -1
+    return dd
 
-    # 3. Decode the nested GPS IFD (location data)
-    gps_ifd = raw_exif.get_ifd(34853)
-    gps_decoded = _decode_ifd(gps_ifd, GPSTAGS)
 
-    # 4. Process GPS data if it exists and is valid
+def _add_gps_data(
+    decoded_data: Dict[str, Any], gps_decoded: Dict[str, Any], image_path: str
+) -> None:
+    """Adds the GPS coordinates and altitude from a decoded GPS IFD."""
+    # Keep GPS coordinates as raw DMS if they exist and are valid. The
+    # conversion to decimal degrees is done in bulk by `convert_dms_to_dd`.
     lat_dms = gps_decoded.get("GPSLatitude")
     lon_dms = gps_decoded.get("GPSLongitude")
     if lat_dms and lon_dms:
         # Check for the corrupt 'Rational with denominator 0' case
         try:
             if lat_dms[0].denominator != 0 and lon_dms[0].denominator != 0:
-                lat = _convert_dms_to_dd(
-                    lat_dms[0],
-                    lat_dms[1],
-                    lat_dms[2],
+                decoded_data["GPSLatitude"] = (
+                    float(lat_dms[0]),
+                    float(lat_dms[1]),
+                    float(lat_dms[2]),
                     gps_decoded.get("GPSLatitudeRef"),
                 )
-                lon = _convert_dms_to_dd(
-                    lon_dms[0],
-                    lon_dms[1],
-                    lon_dms[2],
+                decoded_data["GPSLongitude"] = (
+                    float(lon_dms[0]),
+                    float(lon_dms[1]),
+                    float(lon_dms[2]),
                     gps_decoded.get("GPSLongitudeRef"),
                 )
-                # Add the converted values to our main data dictionary
-                all_decoded_data["GPSLatitude"] = lat
-                all_decoded_data["GPSLongitude"] = lon
         except (AttributeError, ZeroDivisionError, TypeError, ValueError):
             logger.debug(f"Found corrupt GPS tags in {os.path.basename(image_path)}")
 
     # Also add non-coordinate GPS data like altitude
     if "GPSAltitude" in gps_decoded:
-        all_decoded_data["GPSAltitude"] = gps_decoded.get("GPSAltitude")
+        decoded_data["GPSAltitude"] = gps_decoded.get("GPSAltitude")
+
+
+# --- Main Extraction Logic ---
+
+
+def extract_exif_data(
+    image_path: str,
+    schema: ExifSchema,
+    needed_ids: Optional[FrozenSet[int]] = None,
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Extracts specific, user-defined EXIF tags from an image file,
+    searching across all relevant IFDs (Image File Directories).
+
+    The values are returned as a tuple aligned with `schema` (see
+    `build_exif_schema`), with None for tags that were not found.
+    GPSLatitude/GPSLongitude are returned as (degrees, minutes, seconds,
+    direction) quadruples; convert them with `convert_dms_to_dd`.
+
+    `needed_ids` should be precomputed with `build_needed_tag_ids` when
+    processing many images; it is derived from `schema` if omitted.
+    """
+    if needed_ids is None:
+        needed_ids = build_needed_tag_ids(schema)
+
+    raw_exif = _get_exif_data(image_path)
+    if not raw_exif:
+        return None
+
+    # --- THE CORE FIX IS HERE ---
+    # 1. Decode the main IFD (top-level tags)
+    all_decoded_data = _decode_ifd(raw_exif, TAGS, needed_ids)
+
+    # 2. Decode the nested Exif IFD (detailed photo settings), if any non-GPS
+    #    tag is requested. Its values take precedence over the main IFD's.
+    #    The numeric ID 34665 is the standard pointer to the Exif sub-directory.
+    if any(exif_tag_name not in _GPS_TAG_IDS for _, exif_tag_name in schema):
+        exif_ifd = raw_exif.get_ifd(34665)
+        all_decoded_data.update(_decode_ifd(exif_ifd, TAGS, needed_ids))
+
+    # 3. Decode the nested GPS IFD (location data), if any GPS tag is requested
+    if not _GPS_OUTPUT_TAGS.isdisjoint(exif_tag_name for _, exif_tag_name in schema):
+        gps_ifd = raw_exif.get_ifd(34853)
+        gps_decoded = _decode_ifd(gps_ifd, GPSTAGS, needed_ids)
+        _add_gps_data(all_decoded_data, gps_decoded, image_path)
     # --- END OF CORE FIX ---
 
     # Now, build the final result based on the user's config
-    final_data = {}
-    for friendly_name, exif_tag_name in tags_to_extract.items():
-        value = all_decoded_data.get(exif_tag_name)
-        if value is not None:
-            final_data[friendly_name] = value
-        else:
-            final_data[friendly_name] = None  # Explicitly set to None if not found
-            logger.debug(
-                f"Tag '{exif_tag_name}' not found in any IFD for {os.path.basename(image_path)}"
-            )
+    values = tuple(all_decoded_data.get(exif_tag_name) for _, exif_tag_name in schema)
+    if logger.isEnabledFor(logging.DEBUG):
+        for (_, exif_tag_name), value in zip(schema, values):
+            if value is None:
+                logger.debug(
+                    f"Tag '{exif_tag_name}' not found in any IFD for {os.path.basename(image_path)}"
+                )
 
-    return final_data
+    return values
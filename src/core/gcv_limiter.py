@@ -0,0 +1,98 @@
+# src/core/gcv_limiter.py
+"""
+Paces Google Cloud Vision requests made from several threads.
+
+Limits how many requests are in flight at once and how often a new one may
+start, and retries requests rejected for exceeding the rate limit or quota
+with exponential backoff.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger("GeoPhotoToolkitLogger")
+
+T = TypeVar("T")
+
+_RATE_LIMIT_EXCEPTIONS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+)
+_RATE_LIMIT_MARKERS = ("429", "quota", "rate limit")
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether `error` means the request was rejected by a rate limit or quota."""
+    if isinstance(error, _RATE_LIMIT_EXCEPTIONS):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _RATE_LIMIT_MARKERS)
+
+
+class GcvLimiter:
+    """
+    Thread-safe limiter for Google Vision requests.
+
+    Args:
+        max_in_flight (int): The maximum number of concurrent requests.
+        requests_per_second (float): The maximum rate at which requests start.
+        max_retries (int): How often a rate-limited request is retried.
+        backoff_base (float): The delay before the first retry, in seconds;
+            doubled for each further retry.
+        backoff_cap (float): The longest delay between retries, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        requests_per_second: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+    ):
+        self._semaphore = threading.BoundedSemaphore(max_in_flight)
+        self._min_interval = 1.0 / requests_per_second
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        # Monotonic time at which the next request may start.
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_turn(self) -> None:
+        """Blocks until this request's start slot, reserving it first."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed)
+            self._next_allowed = start + self._min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Calls `fn(*args, **kwargs)` within the limits, retrying it while it
+        fails with a rate limit error. Other errors, and the last rate limit
+        error, are raised.
+        """
+        attempt = 0
+        while True:
+            with self._semaphore:
+                self._wait_for_turn()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt >= self._max_retries or not is_rate_limit_error(e):
+                        raise
+                    error = e
+            # Back off without holding a slot, so other requests can proceed.
+            delay = min(self._backoff_cap, self._backoff_base * 2**attempt)
+            attempt += 1
+            logger.warning(
+                f"Google Vision rate limit reached ({error}). "
+                f"Retrying in {delay:.1f}s (attempt {attempt}/{self._max_retries})."
+            )
+            time.sleep(delay)
@@ -1,16 +1,25 @@
 # src/core/image_analysis.py
-import hashlib
 import os
-from typing import Callable
+from collections import defaultdict
+from typing import TYPE_CHECKING, Callable, Dict, List
 
-import pandas as pd
-import tlsh
-from fuzzywuzzy import fuzz
-from PIL import Image
+import xxhash
+
+from src.config import settings
+
+# The heavy dependencies (pandas, NumPy, Pillow, RapidFuzz, TLSH and the Numba
+# kernels) are imported inside the functions that use them, so importing this
+# module stays cheap for CLI commands that never call them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+_IMG_EXT = frozenset(settings.IMAGE_EXTENSIONS)
+# Filename pairs scored per RapidFuzz call (8 bytes each).
+_SIMILARITY_BLOCK_CELLS = 1 << 22
 
 
 # --- Filename Similarity ---
-def find_similar_filenames(folder: str, threshold: int = 90) -> pd.DataFrame:
+def find_similar_filenames(folder: str, threshold: int = 90) -> "pd.DataFrame":
     """
     Finds potential duplicate images based on filename similarity.
 
@@ -21,64 +30,141 @@ def find_similar_filenames(folder: str, threshold: int = 90) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame of potential duplicates.
     """
-    filenames = [
-        f for f in os.listdir(folder) if f.lower().endswith((".png", ".jpg", ".jpeg"))
-    ]
-    potential_duplicates = []
-
-    for i in range(len(filenames)):
-        for j in range(i + 1, len(filenames)):
-            similarity = fuzz.ratio(filenames[i], filenames[j])
-            if similarity >= threshold:
-                potential_duplicates.append(
-                    {
-                        "file_1": filenames[i],
-                        "file_2": filenames[j],
-                        "similarity_score": similarity,
-                    }
-                )
-
-    return pd.DataFrame(potential_duplicates)
-
-
-# --- Exact Duplicates (Cryptographic Hash) ---
-def _calculate_crypto_hash(image_path: str, hash_algo: Callable = hashlib.md5) -> str:
-    """Calculates the cryptographic hash of an image."""
+    import numpy as np
+    import pandas as pd
+    from rapidfuzz import fuzz, process
+
+    with os.scandir(folder) as entries:
+        filenames = [
+            e.name
+            for e in entries
+            if os.path.splitext(e.name)[1].lower() in _IMG_EXT and e.is_file()
+        ]
+
+    # Score the pairs with RapidFuzz's C++ matrix comparator, a block of rows at
+    # a time, each against the names after it, so each pair is scored once and
+    # memory stays bounded. Scores more than 0.5 below the threshold come back
+    # as 0; the rest are rounded half to even, as fuzzywuzzy's `ratio` did with
+    # `round`, before they are compared with the threshold.
+    block_rows = max(1, _SIMILARITY_BLOCK_CELLS // max(len(filenames), 1))
+    file_1, file_2, similarity_scores = [], [], []
+    for start in range(0, len(filenames), block_rows):
+        scores = np.rint(
+            process.cdist(
+                filenames[start : start + block_rows],
+                filenames[start + 1 :],
+                scorer=fuzz.ratio,
+                score_cutoff=max(threshold - 0.5, 0),
+                dtype=np.float64,
+                workers=-1,
+            )
+        )
+        # Row r is compared with the names after it, starting at column r.
+        i, j = np.nonzero(scores >= threshold)
+        keep = j >= i
+        i, j = i[keep], j[keep]
+        file_1.extend(filenames[start + k] for k in i)
+        file_2.extend(filenames[start + 1 + k] for k in j)
+        similarity_scores.append(scores[i, j].astype(np.int64))
+
+    return pd.DataFrame(
+        {
+            "file_1": file_1,
+            "file_2": file_2,
+            "similarity_score": np.concatenate(similarity_scores)
+            if similarity_scores
+            else np.array([], dtype=np.int64),
+        }
+    )
+
+
+# --- Exact Duplicates (Content Hash) ---
+# Duplicate detection only needs to tell files apart, not resist tampering, so
+# the default is the much faster non-cryptographic xxh3-128. Any hashlib
+# constructor (e.g. hashlib.sha256) can still be passed in.
+_HASH_CHUNK_SIZE = 1 << 20  # Bytes read per update when hashing file content.
+_HASH_STRIP_ROWS = 256  # Pixel rows per update when hashing decoded images.
+
+
+def _calculate_crypto_hash(
+    image_path: str,
+    hash_algo: Callable = xxhash.xxh3_128,
+    compare_pixels: bool = False,
+) -> str:
+    """
+    Calculates the content hash of an image file, or of its decoded RGB pixels
+    if `compare_pixels` is set.
+    """
     hash_obj = hash_algo()
+    if not compare_pixels:
+        with open(image_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+
+    from PIL import Image
+
     with Image.open(image_path) as img:
         # Convert to a consistent format to handle minor variations
         img = img.convert("RGB")
-        hash_obj.update(img.tobytes())
+        # Hash in row strips so we never hold a second full-size copy of the
+        # pixel buffer; the digest is identical to hashing `img.tobytes()`.
+        width, height = img.size
+        for top in range(0, height, _HASH_STRIP_ROWS):
+            strip = img.crop((0, top, width, min(top + _HASH_STRIP_ROWS, height)))
+            hash_obj.update(strip.tobytes())
     return hash_obj.hexdigest()
 
 
 def find_exact_duplicates(
-    folder: str, hash_algo: Callable = hashlib.md5
-) -> pd.DataFrame:
+    folder: str,
+    hash_algo: Callable = xxhash.xxh3_128,
+    compare_pixels: bool = False,
+) -> "pd.DataFrame":
     """
     Finds exact duplicate images based on their content hash.
 
     Args:
         folder (str): Path to the folder with images.
-        hash_algo (Callable): The hash function to use from hashlib (e.g., md5, sha256).
+        hash_algo (Callable): The hash constructor to use (e.g., xxhash.xxh3_128,
+                              hashlib.sha256).
+        compare_pixels (bool): Compare decoded pixels instead of raw file bytes, so
+                               images that differ only in metadata or encoding are
+                               still reported. Much slower, as every image is decoded.
 
     Returns:
         pd.DataFrame: A DataFrame of duplicate file pairs.
     """
-    image_hashes = {}
-    duplicates = []
+    import pandas as pd
+
+    # Files can only have identical content if they have identical sizes, so
+    # bucket by size first and hash only the buckets holding more than one file.
+    # Identical pixels can come from files of different sizes, so pixel
+    # comparison puts everything in a single bucket.
+    size_map: Dict[int, List[os.DirEntry]] = defaultdict(list)
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() in _IMG_EXT and entry.is_file():
+                try:
+                    size = 0 if compare_pixels else entry.stat().st_size
+                except OSError:
+                    continue
+                size_map[size].append(entry)
 
-    for filename in os.listdir(folder):
-        if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-            img_path = os.path.join(folder, filename)
+    duplicates = []
+    for same_size_entries in size_map.values():
+        if len(same_size_entries) < 2:
+            continue
+        image_hashes = {}
+        for entry in same_size_entries:
             try:
-                img_hash = _calculate_crypto_hash(img_path, hash_algo)
+                img_hash = _calculate_crypto_hash(entry.path, hash_algo, compare_pixels)
                 if img_hash in image_hashes:
                     duplicates.append(
-                        {"original": image_hashes[img_hash], "duplicate": filename}
+                        {"original": image_hashes[img_hash], "duplicate": entry.name}
                     )
                 else:
-                    image_hashes[img_hash] = filename
+                    image_hashes[img_hash] = entry.name
             except Exception:
                 continue  # Skip files that can't be opened
 
@@ -88,6 +174,9 @@ def find_exact_duplicates(
 # --- Visual Similarity (Perceptual Hash) ---
 def _calculate_tlsh(image_path: str) -> str:
     """Calculates the TLSH (fuzzy) hash of an image."""
+    import tlsh
+    from PIL import Image
+
     with Image.open(image_path) as img:
         img = img.convert("RGB")
         img_bytes = img.tobytes()
@@ -96,7 +185,7 @@ def _calculate_tlsh(image_path: str) -> str:
 
 def find_visually_similar_images(
     folder: str, similarity_threshold: int = 100
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
     """
     Finds visually similar images using the TLSH fuzzy hashing algorithm.
 
@@ -108,26 +197,40 @@ def find_visually_similar_images(
     Returns:
         pd.DataFrame: DataFrame of similar image pairs and their difference score.
     """
-    filenames = [
-        f for f in os.listdir(folder) if f.lower().endswith((".png", ".jpg", ".jpeg"))
-    ]
-    hashes = {}
-    for filename in filenames:
+    import numpy as np
+    import pandas as pd
+
+    from src.core.tlsh_distance import (
+        TLSH_DIGEST_BYTES,
+        decode_tlsh_digests,
+        find_similar_pairs,
+    )
+
+    with os.scandir(folder) as entries:
+        image_entries = [
+            e
+            for e in entries
+            if os.path.splitext(e.name)[1].lower() in _IMG_EXT and e.is_file()
+        ]
+    hashed_files = []
+    digests = []
+    for entry in image_entries:
         try:
-            hashes[filename] = _calculate_tlsh(os.path.join(folder, filename))
+            digest = _calculate_tlsh(entry.path)
         except Exception:
             continue
-
-    similar_pairs = []
-    items = list(hashes.items())
-    for i in range(len(items)):
-        for j in range(i + 1, len(items)):
-            file1, hash1 = items[i]
-            file2, hash2 = items[j]
-            score = tlsh.diff(hash1, hash2)
-            if score <= similarity_threshold:
-                similar_pairs.append(
-                    {"file_1": file1, "file_2": file2, "difference_score": score}
-                )
-
-    return pd.DataFrame(similar_pairs).sort_values(by="difference_score")
+        # Images with too little variation get the placeholder digest 'TNULL',
+        # which cannot be compared.
+        if len(digest.removeprefix("T1")) == 2 * TLSH_DIGEST_BYTES:
+            hashed_files.append(entry.name)
+            digests.append(digest)
+
+    first, second, scores = find_similar_pairs(
+        decode_tlsh_digests(digests), similarity_threshold
+    )
+    names = np.asarray(hashed_files, dtype=object)
+    similar_pairs = pd.DataFrame(
+        {"file_1": names[first], "file_2": names[second], "difference_score": scores}
+    )
+
+    return similar_pairs.sort_values(by="difference_score")
@@ -1,96 +1,303 @@
 # src/core/kml.py
 import logging
 import os
+import string
 import zipfile
+from itertools import repeat
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from xml.sax.saxutils import XMLGenerator
 
+import numpy as np
 import pandas as pd
-import simplekml
 
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
+_KML_NAMESPACE = "http://www.opengis.net/kml/2.2"
+_KMZ_WRITE_BUFFER_SIZE = 1 << 20
+
+# Media formats that are already compressed, so deflating them only costs CPU.
+COMPRESSED_MEDIA_EXTENSIONS = frozenset(
+    {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic"}
+)
+
+
+def _parse_simple_template(template: str) -> Optional[List[Tuple[Any, ...]]]:
+    """
+    Parses a `str.format` template. Returns its parts if every placeholder is
+    a plain `{field}`; None for templates using format specs, conversions or
+    attribute/index lookups, and for malformed templates.
+    """
+    try:
+        parts = list(string.Formatter().parse(template))
+    except ValueError:
+        return None
+
+    for _, field_name, format_spec, conversion in parts:
+        if field_name is None:
+            continue
+        if (
+            format_spec
+            or conversion
+            or not field_name
+            or field_name.isdigit()
+            or "." in field_name
+            or "[" in field_name
+        ):
+            return None
+    return parts
+
+
+def template_field_names(template: str) -> Optional[Set[str]]:
+    """
+    Returns the columns a description template reads, or None if they cannot
+    be determined (see `_parse_simple_template`).
+    """
+    parts = _parse_simple_template(template)
+    if parts is None:
+        return None
+    return {field_name for _, field_name, _, _ in parts if field_name is not None}
+
+
+def _compile_description_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Parses a `str.format` template once and returns a function that renders it
+    for a single record. Only plain `{field}` placeholders take the fast path;
+    other templates (and malformed ones, which then raise for each row, as
+    before) are rendered with `str.format_map`.
+    """
+    parts = _parse_simple_template(template)
+    if parts is None:
+        return template.format_map
+
+    def render(record: Dict[str, Any]) -> str:
+        return "".join(
+            literal if field_name is None else literal + str(record[field_name])
+            for literal, field_name, _, _ in parts
+        )
+
+    return render
+
+
+def render_descriptions(df: pd.DataFrame, template: str) -> Optional[List[str]]:
+    """
+    Renders a description template for every row at once, a column at a time.
+    Returns None if the template is not made of plain `{field}` placeholders
+    or uses a column `df` lacks; it is then rendered per row instead.
+    """
+    parts = _parse_simple_template(template)
+    if parts is None or any(
+        field_name is not None and field_name not in df.columns
+        for _, field_name, _, _ in parts
+    ):
+        return None
+
+    descriptions = np.full(len(df), "", dtype=object)
+    for literal, field_name, _, _ in parts:
+        if literal:
+            descriptions += literal
+        if field_name is None:
+            continue
+        column = df[field_name]
+        if pd.api.types.is_string_dtype(column) and not column.hasnans:
+            values = column.to_numpy(dtype=object)
+        else:
+            # Formatted like `str.format` would, from the same boxed values.
+            values = np.empty(len(df), dtype=object)
+            values[:] = list(map(str, column.tolist()))
+        descriptions += values
+    return descriptions.tolist()
+
+
+def _media_filenames(df: pd.DataFrame, column: str) -> List[Optional[str]]:
+    """
+    Returns the file name of each row's media path in `column`, or None where the
+    row has no path (or the column does not exist).
+    """
+    if column not in df.columns:
+        return [None] * len(df)
+    filenames = df[column].map(os.path.basename, na_action="ignore")
+    return filenames.astype(object).where(filenames.notna(), None).tolist()
+
+
+def _write_text_element(
+    xml: XMLGenerator, tag: str, text: str, attrs: Optional[Dict[str, str]] = None
+) -> None:
+    """Writes `<tag attrs>text</tag>`, escaping the text."""
+    xml.startElement(tag, attrs or {})
+    xml.characters(text)
+    xml.endElement(tag)
+
 
 def create_kml_file(
     df: pd.DataFrame,
     folder_name: str,
     output_kml_path: str,
     description_template: str | None,
+    descriptions: Optional[Sequence[str]] = None,
 ) -> None:
     """
     Creates a KML file from a DataFrame, using a template for the description.
-    """
-    kml = simplekml.Kml(name=folder_name)
-    folder = kml.newfolder(name=folder_name)
+    `descriptions`, if given, are the already rendered descriptions of the
+    rows (see `render_descriptions`) and take the template's place.
 
+    Placemarks are streamed to disk as they are built, so memory use does not
+    grow with the number of points.
+    """
     # Use 'photo_path' for local files from gps-extract, fallback to 'local_photo_path' for downloaded files
     photo_col = "photo_path" if "photo_path" in df.columns else "local_photo_path"
     icon_col = "icon_url" if "icon_url" in df.columns else "local_icon_path"
+    photo_filenames = _media_filenames(df, photo_col)
+    icon_filenames = _media_filenames(df, icon_col)
 
-    for _, row in df.iterrows():
-        try:
-            # Format the description using the template
-            if description_template:
-                description = description_template.format(**row.to_dict())
-            else:
-                description = row.get("description", "")
-
-            point = folder.newpoint(
-                name=row.get("name", ""),
-                description=description,
-                coords=[
-                    (row["longitude"], row["latitude"])
-                ],  # Assumes lon/lat columns exist
-            )
+    render_description = (
+        _compile_description_template(description_template)
+        if description_template and descriptions is None
+        else None
+    )
 
-            # Add photo if a local path is provided
-            if photo_col in df.columns and pd.notna(row.get(photo_col)):
-                photo_filename = os.path.basename(row[photo_col])
-                point.description += (
-                    f"<br/><img width='480' src='files/{photo_filename}'/>"
+    with open(output_kml_path, "w", encoding="utf-8") as f:
+        xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("kml", {"xmlns": _KML_NAMESPACE})
+        xml.startElement("Document", {})
+        _write_text_element(xml, "name", folder_name)
+        xml.startElement("Folder", {})
+        _write_text_element(xml, "name", folder_name)
+
+        # Plain dicts are far cheaper to access than the Series built by iterrows().
+        records = df.to_dict(orient="records")
+        for row, photo_filename, icon_filename, rendered in zip(
+            records,
+            photo_filenames,
+            icon_filenames,
+            descriptions if descriptions is not None else repeat(None),
+        ):
+            # Resolve every value before writing, so a bad row leaves no partial
+            # placemark behind.
+            try:
+                # Format the description using the template
+                if rendered is not None:
+                    description = rendered
+                elif render_description:
+                    description = render_description(row)
+                else:
+                    description = row.get("description", "")
+                # Assumes lon/lat columns exist
+                coordinates = f"{row['longitude']},{row['latitude']},0.0"
+            except (KeyError, ValueError) as e:
+                logger.warning(
+                    f"Skipping row due to missing required column or formatting error: {e} - Row: {row.get('name')}"
                 )
-                point.extendeddata.newdata(
-                    name="photo", value=f"files/{photo_filename}"
+                continue
+
+            # Add photo if a local path is provided
+            if photo_filename is not None:
+                description = (
+                    f"{description}<br/><img width='480' src='files/{photo_filename}'/>"
                 )
 
+            xml.ignorableWhitespace("\n")
+            xml.startElement("Placemark", {})
+            _write_text_element(xml, "name", str(row.get("name", "")))
+            _write_text_element(xml, "description", str(description))
+
             # Add custom icon if a local path is provided
-            if icon_col in df.columns and pd.notna(row.get(icon_col)):
-                icon_filename = os.path.basename(row[icon_col])
-                point.style.iconstyle.icon.href = f"files/{icon_filename}"
-
-        except (KeyError, ValueError) as e:
-            logger.warning(
-                f"Skipping row due to missing required column or formatting error: {e} - Row: {row.get('name')}"
-            )
-            continue
+            if icon_filename is not None:
+                xml.startElement("Style", {})
+                xml.startElement("IconStyle", {})
+                xml.startElement("Icon", {})
+                _write_text_element(xml, "href", f"files/{icon_filename}")
+                xml.endElement("Icon")
+                xml.endElement("IconStyle")
+                xml.endElement("Style")
+
+            if photo_filename is not None:
+                xml.startElement("ExtendedData", {})
+                xml.startElement("Data", {"name": "photo"})
+                _write_text_element(xml, "value", f"files/{photo_filename}")
+                xml.endElement("Data")
+                xml.endElement("ExtendedData")
+
+            xml.startElement("Point", {})
+            _write_text_element(xml, "coordinates", coordinates)
+            xml.endElement("Point")
+            xml.endElement("Placemark")
+
+        xml.ignorableWhitespace("\n")
+        xml.endElement("Folder")
+        xml.endElement("Document")
+        xml.endElement("kml")
+        xml.endDocument()
 
-    kml.save(output_kml_path)
     logger.info(f"KML file created at: {output_kml_path}")
 
 
 def create_kmz_archive(
-    kml_path: str, df_with_paths: pd.DataFrame, output_kmz_path: str
+    kml_path: str,
+    df_with_paths: pd.DataFrame,
+    output_kmz_path: str,
+    stored_extensions: AbstractSet[str] = COMPRESSED_MEDIA_EXTENSIONS,
 ) -> None:
-    # ... (This function does not need to change)
-    with zipfile.ZipFile(output_kmz_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        zipf.write(kml_path, arcname="doc.kml")
-        media_files_folder = "files"
-        media_columns = [
-            "photo_path",
-            "local_photo_path",
-            "icon_url",
-            "local_icon_path",
-        ]
-        for col in media_columns:
-            if col in df_with_paths:
-                for file_path in df_with_paths[col].dropna().unique():
-                    if os.path.exists(file_path):
-                        arcname = os.path.join(
-                            media_files_folder, os.path.basename(file_path)
-                        )
-                        zipf.write(file_path, arcname=arcname)
-                    else:
-                        if not str(file_path).startswith(("http", "https")):
-                            logger.warning(
-                                f"Media file not found, will not be included in KMZ: {file_path}"
+    """
+    Packs the KML file and the media files it refers to into a KMZ archive.
+    Media whose (lowercase) extension is in `stored_extensions` is stored
+    as-is; everything else, including the KML itself, is deflated.
+    """
+    # A large write buffer batches syscalls.
+    with open(output_kmz_path, "wb", buffering=_KMZ_WRITE_BUFFER_SIZE) as f:
+        with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+            zipf.write(kml_path, arcname="doc.kml")
+            media_files_folder = "files"
+            # The file added under each name. A file listed in several columns
+            # is only added once.
+            added_files: Dict[str, str] = {}
+            media_columns = [
+                "photo_path",
+                "local_photo_path",
+                "icon_url",
+                "local_icon_path",
+            ]
+            for col in media_columns:
+                if col in df_with_paths:
+                    for file_path in df_with_paths[col].dropna().unique():
+                        if os.path.exists(file_path):
+                            arcname = os.path.join(
+                                media_files_folder, os.path.basename(file_path)
+                            )
+                            added_file = added_files.get(arcname)
+                            if added_file is not None:
+                                # The KML refers to media by file name, so only
+                                # one file of that name can be used.
+                                if not os.path.samefile(added_file, file_path):
+                                    logger.warning(
+                                        f"Media file {file_path} has the same name "
+                                        f"as {added_file}, will not be included "
+                                        "in KMZ."
+                                    )
+                                continue
+                            added_files[arcname] = file_path
+                            extension = os.path.splitext(file_path)[1].lower()
+                            zipf.write(
+                                file_path,
+                                arcname=arcname,
+                                compress_type=zipfile.ZIP_STORED
+                                if extension in stored_extensions
+                                else zipfile.ZIP_DEFLATED,
                             )
+                        else:
+                            if not str(file_path).startswith(("http", "https")):
+                                logger.warning(
+                                    f"Media file not found, will not be included in KMZ: {file_path}"
+                                )
     os.remove(kml_path)
     logger.info(f"KMZ archive created and KML file removed. Output: {output_kmz_path}")
@@ -1,202 +1,537 @@
 # src/core/ocr.py
 import logging
 import os
-from typing import List, Optional, Tuple
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import easyocr
+import numpy as np
 from google.cloud import vision
+from google.oauth2 import service_account
 
-from src.config import OCREngine  # --- THE FIX IS HERE ---
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; see `_scan_gps_formats`.
+    hyperscan = None
+
+from src.config import OCREngine, settings  # --- THE FIX IS HERE ---
+from src.core.gcv_limiter import GcvLimiter, is_rate_limit_error
 
 # --- Setup ---
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
-# Initialize EasyOCR reader once to load the model into memory.
-try:
-    easyocr_reader = easyocr.Reader(["en", "id"], gpu=False)
-    logger.info("EasyOCR reader initialized successfully.")
-except Exception as e:
-    logger.warning(f"Could not initialize EasyOCR: {e}. It will not be available.")
-    easyocr_reader = None
+EASYOCR_LANGUAGES = ["en", "id"]
+
+
+def _easyocr_use_gpu() -> bool:
+    """
+    Decides whether EasyOCR runs on the GPU: as set by the GEOPHOTO_EASYOCR_GPU
+    environment variable, or else whenever PyTorch can see a CUDA device.
+    """
+    if settings.GEOPHOTO_EASYOCR_GPU is not None:
+        return settings.GEOPHOTO_EASYOCR_GPU
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def create_easyocr_reader() -> easyocr.Reader:
+    """Loads an EasyOCR reader for the toolkit's languages."""
+    use_gpu = _easyocr_use_gpu()
+    logger.debug(f"Loading EasyOCR models on the {'GPU' if use_gpu else 'CPU'}.")
+    # On the CPU, use the int8-quantized models.
+    return easyocr.Reader(EASYOCR_LANGUAGES, gpu=use_gpu, quantize=not use_gpu)
+
+
+def _load_easyocr_reader() -> Optional[easyocr.Reader]:
+    """Loads the EasyOCR models, or returns None if EasyOCR cannot be used."""
+    try:
+        reader = create_easyocr_reader()
+        logger.info("EasyOCR reader initialized successfully.")
+        return reader
+    except Exception as e:
+        logger.warning(f"Could not initialize EasyOCR: {e}. It will not be available.")
+        return None
+
+
+# Initialize EasyOCR reader once to load the model into memory. Loading takes
+# seconds, so it runs in the background from import time; `_get_reader` waits
+# for it only when OCR is first needed.
+_warmup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="easyocr")
+_easyocr_reader_future = _warmup_executor.submit(_load_easyocr_reader)
+_warmup_executor.shutdown(wait=False)
+
+
+def _get_reader() -> Optional[easyocr.Reader]:
+    """Returns the shared EasyOCR reader, waiting for it to finish loading."""
+    return _easyocr_reader_future.result()
+
 
 # Google Vision client is initialized on-demand to handle dynamic key paths.
 gcv_client = None
+_gcv_client_lock = threading.Lock()
+
+# The most images Google Vision accepts in one `batch_annotate_images` request.
+GCV_MAX_BATCH_SIZE = 16
+# Images per EasyOCR batch; same-sized ones share a text detection pass.
+EASYOCR_BATCH_SIZE = 8
+
+# --- GPS Patterns ---
+# Compiled once here, as they are matched against every OCR text block.
+
+# Stricter regex for DMS/DM/Decimal formats (avoid matching huge numbers)
+_DMS_RE = re.compile(
+    r'(\d{1,2})[°\s]?(\d{1,2})[\s\'"]?(\d{1,2}(?:\.\d+)?)?["\s]?([NS])'
+    r'.*?(\d{1,3})[°\s]?(\d{1,2})[\s\'"]?(\d{1,2}(?:\.\d+)?)?["\s]?([EW])',
+    re.IGNORECASE,
+)
+
+# Stricter regex for DDM format
+_DDM_RE = re.compile(
+    r'(\d{1,2})[°\s]?([\d.]+)[\s\'"]?([NS])'
+    r'.*?(\d{1,3})[°\s]?([\d.]+)[\s\'"]?([EW])',
+    re.IGNORECASE,
+)
+
+# Fallback decimal degrees (DD) format
+_DD_RE = re.compile(r"(-?\d{1,2}\.\d{4,})\s*[NS]?[, ]\s*(-?\d{1,3}\.\d{4,})\s*[EW]?")
+
+# Necessary for a DD match; with the hemisphere letter check in
+# `_match_gps_text`, rules out text that none of the formats can match.
+_DD_RE_PREFILTER = re.compile(r"\d\.\d{4}")
+
+# Text normalisation applied before matching.
+_CLEAN_TABLE = str.maketrans({"\n": " ", "*": "°", "/": "'", ",": "."})
+_UNWANTED_CHARS_RE = re.compile(r'[^\dNSEW°\'".\- ]+')
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Format IDs, in the order `_match_gps_text` tries them.
+_DMS, _DDM, _DD = 0, 1, 2
+_ALL_FORMATS = frozenset((_DMS, _DDM, _DD))
+_FORMAT_NAMES = ("DMS", "DDM", "DD")
+_GPS_PATTERNS = ((_DMS, _DMS_RE), (_DDM, _DDM_RE), (_DD, _DD_RE))
+
+
+def _compile_gps_scanner():
+    """
+    Compiles the three GPS patterns into a single Hyperscan database, so one
+    pass over a text block tells which formats can match. Returns None if
+    Hyperscan is not installed or rejects the patterns.
+    """
+    if hyperscan is None:
+        return None
+    patterns = (_DMS_RE, _DDM_RE, _DD_RE)
+    flags = (
+        hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.pattern.encode("utf-8") for pattern in patterns],
+            ids=[_DMS, _DDM, _DD],
+            elements=3,
+            flags=[
+                flags | hyperscan.HS_FLAG_CASELESS,
+                flags | hyperscan.HS_FLAG_CASELESS,
+                flags,
+            ],
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Could not compile GPS patterns with Hyperscan: {e}")
+        return None
+    return database
 
 
-# --- Shared Parsing Logic ---
-def _parse_gps_from_text(text: str) -> Optional[Tuple[float, float]]:
+_GPS_SCANNER = _compile_gps_scanner()
+# Hyperscan scratch space must not be shared between threads.
+_scanner_local = threading.local()
+
+
+def _scan_gps_formats(cleaned: str) -> FrozenSet[int]:
     """
-    Parses a single block of text to find and extract GPS coordinates.
-    Supports DMS, DDM, and DD formats.
+    Returns the IDs of the GPS formats that occur somewhere in `cleaned`, so
+    the (slower) capturing regexes only run where they will match. Without
+    Hyperscan every format is a candidate.
     """
-    import re
+    if _GPS_SCANNER is None:
+        return _ALL_FORMATS
+    scratch = getattr(_scanner_local, "scratch", None)
+    if scratch is None:
+        scratch = _scanner_local.scratch = hyperscan.Scratch(_GPS_SCANNER)
 
-    # Normalize and clean text
-    cleaned = (
-        text.replace("\n", " ")
-        .replace("*", "°")
-        .replace("/", "'")
-        .replace(",", ".")
-        .replace("  ", " ")
-    )
-    cleaned = re.sub(r'[^\dNSEW°\'".\- ]+', " ", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned)
-
-    # Stricter regex for DMS/DM/Decimal formats (avoid matching huge numbers)
-    coord_regex = re.compile(
-        r'(\d{1,2})[°\s]?(\d{1,2})[\s\'"]?(\d{1,2}(?:\.\d+)?)?["\s]?([NS])'
-        r'.*?(\d{1,3})[°\s]?(\d{1,2})[\s\'"]?(\d{1,2}(?:\.\d+)?)?["\s]?([EW])',
-        re.IGNORECASE,
-    )
+    found = set()
 
-    # Stricter regex for DDM format
-    ddm_regex = re.compile(
-        r'(\d{1,2})[°\s]?([\d.]+)[\s\'"]?([NS])'
-        r'.*?(\d{1,3})[°\s]?([\d.]+)[\s\'"]?([EW])',
-        re.IGNORECASE,
-    )
+    def on_match(format_id, start, end, flags, context):
+        found.add(format_id)
+        # DMS is tried first, so nothing else matters once it is found.
+        return format_id == _DMS
 
-    # Try DMS first
-    match = coord_regex.search(cleaned)
-    if match:
-        try:
-            lat_deg = float(match.group(1))
-            lat_min = float(match.group(2) or 0)
-            lat_sec = float(match.group(3) or 0)
-            lat_hem = match.group(4).upper()
-            lon_deg = float(match.group(5))
-            lon_min = float(match.group(6) or 0)
-            lon_sec = float(match.group(7) or 0)
-            lon_hem = match.group(8).upper()
-            # Convert to decimal degrees
-            lat_dd = lat_deg + lat_min / 60 + lat_sec / 3600
-            lon_dd = lon_deg + lon_min / 60 + lon_sec / 3600
-            if lat_hem == "S":
-                lat_dd = -lat_dd
-            if lon_hem == "W":
-                lon_dd = -lon_dd
-            # Validate ranges
-            if not (-90 <= lat_dd <= 90 and -180 <= lon_dd <= 180):
-                logger.warning(
-                    f"GPS Parsing DMS out of range: lat={lat_dd}, lon={lon_dd} | Raw text: '{text}'"
-                )
-                return None
-            logger.info(
-                f"GPS Parsing: Raw text: '{text}' | Format: DMS | Parsed: lat={lat_dd}, lon={lon_dd} | Converted DD: ({lat_dd}, {lon_dd})"
-            )
-            return (lat_dd, lon_dd)
-        except Exception as e:
-            logger.warning(f"GPS Parsing DMS failed: {e} | Raw text: '{text}'")
-            return None
+    try:
+        _GPS_SCANNER.scan(
+            cleaned.encode("utf-8"), match_event_handler=on_match, scratch=scratch
+        )
+    except hyperscan.ScanTerminated:
+        pass
+    return frozenset(found)
 
-    # Try DDM format
-    match = ddm_regex.search(cleaned)
-    if match:
-        try:
-            lat_deg = float(match.group(1))
-            lat_min = float(match.group(2) or 0)
-            lat_hem = match.group(3).upper()
-            lon_deg = float(match.group(4))
-            lon_min = float(match.group(5) or 0)
-            lon_hem = match.group(6).upper()
-            # Convert to decimal degrees
-            lat_dd = lat_deg + lat_min / 60
-            lon_dd = lon_deg + lon_min / 60
-            if lat_hem == "S":
-                lat_dd = -lat_dd
-            if lon_hem == "W":
-                lon_dd = -lon_dd
-            # Validate ranges
-            if not (-90 <= lat_dd <= 90 and -180 <= lon_dd <= 180):
-                logger.warning(
-                    f"GPS Parsing DDM out of range: lat={lat_dd}, lon={lon_dd} | Raw text: '{text}'"
-                )
-                return None
-            logger.info(
-                f"GPS Parsing: Raw text: '{text}' | Format: DDM | Parsed: lat={lat_dd}, lon={lon_dd} | Converted DD: ({lat_dd}, {lon_dd})"
-            )
-            return (lat_dd, lon_dd)
-        except Exception as e:
-            logger.warning(f"GPS Parsing DDM failed: {e} | Raw text: '{text}'")
-            return None
 
-    # Fallback: try to find decimal degrees (DD) format
-    dd_pattern = re.compile(
-        r"(-?\d{1,2}\.\d{4,})\s*[NS]?[, ]\s*(-?\d{1,3}\.\d{4,})\s*[EW]?"
-    )
-    match = dd_pattern.search(cleaned)
-    if match:
-        try:
-            lat = float(match.group(1))
-            lon = float(match.group(2))
-            # Validate ranges
-            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
-                logger.warning(
-                    f"GPS Parsing DD out of range: lat={lat}, lon={lon} | Raw text: '{text}'"
-                )
-                return None
-            logger.info(
-                f"GPS Parsing: Raw text: '{text}' | Format: DD | Parsed: lat={lat}, lon={lon} | Converted DD: ({lat}, {lon})"
-            )
-            return (lat, lon)
-        except Exception as e:
-            logger.warning(f"GPS Parsing DD failed: {e} | Raw text: '{text}'")
-            return None
+# --- Shared Parsing Logic ---
+def _clean_text(text: str) -> str:
+    """Normalizes common OCR misreads and strips everything but coordinate text."""
+    # Runs of spaces are collapsed by `_WHITESPACE_RE` below.
+    cleaned = text.translate(_CLEAN_TABLE)
+    cleaned = _UNWANTED_CHARS_RE.sub(" ", cleaned)
+    return _WHITESPACE_RE.sub(" ", cleaned)
+
+
+def _match_gps_text(text: str) -> Optional[Tuple[int, re.Match]]:
+    """
+    Finds a GPS coordinate pair in a single block of text. The DMS, DDM and DD
+    formats are tried in that order; returns the first format that matches
+    and its match object.
+    """
+    cleaned = _clean_text(text)
+    # DMS and DDM need both hemisphere letters (cleaning keeps only upper
+    # case), DD a decimal number. Most text blocks have neither.
+    if not (
+        ("N" in cleaned or "S" in cleaned) and ("E" in cleaned or "W" in cleaned)
+    ) and not _DD_RE_PREFILTER.search(cleaned):
+        return None
+    candidates = _scan_gps_formats(cleaned)
+    for format_id, pattern in _GPS_PATTERNS:
+        if format_id in candidates:
+            match = pattern.search(cleaned)
+            if match:
+                return format_id, match
     return None
 
 
-def _convert_dms_to_dd(d, m, s, h):
-    return (float(d) + float(m) / 60 + float(s) / 3600) * (-1 if h in ["S", "W"] else 1)
+def _match_components(format_id: int, match: re.Match) -> Tuple[float, ...]:
+    """
+    Splits a match into latitude and longitude (degrees, minutes, seconds,
+    is_negative) components, in that order. Raises ValueError if a captured
+    number is malformed.
+    """
+    groups = match.groups()
+    if format_id == _DMS:
+        return (
+            float(groups[0]),
+            float(groups[1] or 0),
+            float(groups[2] or 0),
+            groups[3].upper() == "S",
+            float(groups[4]),
+            float(groups[5] or 0),
+            float(groups[6] or 0),
+            groups[7].upper() == "W",
+        )
+    if format_id == _DDM:
+        return (
+            float(groups[0]),
+            float(groups[1] or 0),
+            0.0,
+            groups[2].upper() == "S",
+            float(groups[3]),
+            float(groups[4] or 0),
+            0.0,
+            groups[5].upper() == "W",
+        )
+    # DD values carry their own sign.
+    return (float(groups[0]), 0.0, 0.0, False, float(groups[1]), 0.0, 0.0, False)
+
+
+def _convert_dms_to_dd_batch(
+    d: np.ndarray, m: np.ndarray, s: np.ndarray, h_is_neg: np.ndarray
+) -> np.ndarray:
+    """Converts arrays of degrees, minutes and seconds to signed decimal degrees."""
+    out = d + m / 60 + s / 3600
+    return np.where(h_is_neg, -out, out)
+
+
+def _gps_from_match(
+    text: str, format_id: int, match: re.Match
+) -> Optional[Tuple[float, float, str]]:
+    """
+    Converts a block's coordinate match to decimal degrees. Returns None, after
+    logging why, if it is malformed or out of range.
+    """
+    format_name = _FORMAT_NAMES[format_id]
+    try:
+        components = _match_components(format_id, match)
+    except ValueError as e:
+        logger.warning(
+            "GPS Parsing %s failed: %s | Raw text: '%s'", format_name, e, text
+        )
+        return None
+    # Latitude and longitude are converted together.
+    values = np.array(components, dtype=np.float64).reshape(2, 4)
+    lat, lon = _convert_dms_to_dd_batch(
+        values[:, 0], values[:, 1], values[:, 2], values[:, 3] > 0
+    ).tolist()
+    # Validate ranges
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        logger.warning(
+            "GPS Parsing %s out of range: lat=%s, lon=%s | Raw text: '%s'",
+            format_name,
+            lat,
+            lon,
+            text,
+        )
+        return None
+    # Lazy %-style arguments: nothing is formatted unless INFO is enabled.
+    logger.info(
+        "GPS Parsing: Raw text: '%s' | Format: %s | Parsed: lat=%s, lon=%s"
+        " | Converted DD: (%s, %s)",
+        text,
+        format_name,
+        lat,
+        lon,
+        lat,
+        lon,
+    )
+    return lat, lon, text
 
 
-def _convert_ddm_to_dd(d, dm, h):
-    return (float(d) + float(dm) / 60) * (-1 if h in ["S", "W"] else 1)
+def _parse_gps_from_texts(texts: List[str]) -> Optional[Tuple[float, float, str]]:
+    """
+    Parses GPS coordinates from OCR text blocks. Supports DMS, DDM, and DD
+    formats.
+
+    Returns:
+        Optional[Tuple[float, float, str]]: The coordinates from the first
+        block that holds a valid pair, and that block's text.
+    """
+    # Blocks are matched lazily, so none after the first valid pair is read.
+    results = (
+        _gps_from_match(text, *found)
+        for text in texts
+        if (found := _match_gps_text(text)) is not None
+    )
+    return next((result for result in results if result), None)
 
 
 # --- Engine-Specific Private Functions ---
 
 
-def _extract_text_with_easyocr(image_path: str) -> Optional[List[str]]:
-    """Uses EasyOCR to get a list of text blocks from an image."""
-    if not easyocr_reader:
+def _extract_text_with_easyocr_from_array(
+    img: np.ndarray, image_path: str
+) -> Optional[List[str]]:
+    """
+    Uses EasyOCR to get a list of text blocks from an already decoded image.
+    `image_path` is only used in log messages.
+    """
+    reader = _get_reader()
+    if not reader:
         return None
     try:
-        with open(image_path, "rb") as f:
-            image_bytes = f.read()
-        return easyocr_reader.readtext(image_bytes, detail=0, paragraph=False)
+        return reader.readtext(img, detail=0, paragraph=False)
     except Exception as e:
         logger.error(f"EasyOCR processing failed for {image_path}: {e}")
         return None
 
 
-def _extract_text_with_google_vision(
-    image_path: str, key_path: Optional[str]
-) -> Optional[str]:
-    """Uses Google Cloud Vision to get a single block of text from an image."""
+def _extract_text_with_easyocr_from_arrays(
+    images: List[np.ndarray], image_paths: List[str]
+) -> List[Optional[List[str]]]:
+    """
+    Uses EasyOCR to get the text blocks of several decoded images, running
+    same-sized images through the text detector together. `image_paths` is
+    only used in log messages.
+
+    Returns:
+        List[Optional[List[str]]]: The text blocks of each image, or None where
+        OCR failed, in the same order as `images`.
+    """
+    results: List[Optional[List[str]]] = [None] * len(images)
+    reader = _get_reader()
+    if not reader:
+        return results
+
+    # `readtext_batched` needs equally sized images. Grouping by shape avoids
+    # resizing, which would change what the models see.
+    groups: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+    for index, img in enumerate(images):
+        groups[img.shape].append(index)
+
+    for indices in groups.values():
+        if len(indices) == 1:
+            index = indices[0]
+            results[index] = _extract_text_with_easyocr_from_array(
+                images[index], image_paths[index]
+            )
+            continue
+        try:
+            blocks_per_image = reader.readtext_batched(
+                [images[index] for index in indices], detail=0, paragraph=False
+            )
+        except Exception as e:
+            paths = ", ".join(image_paths[index] for index in indices)
+            logger.error(f"EasyOCR processing failed for {paths}: {e}")
+            continue
+        for index, blocks in zip(indices, blocks_per_image):
+            results[index] = blocks
+    return results
+
+
+def _get_gcv_client(key_path: Optional[str]) -> Optional[vision.ImageAnnotatorClient]:
+    """
+    Returns the shared Google Vision client, creating it on first use. The
+    client keeps one gRPC channel, which concurrent requests share.
+    """
     global gcv_client
-    try:
+    if gcv_client is not None:
+        return gcv_client
+    with _gcv_client_lock:
+        # Another thread may have created it while this one waited.
         if gcv_client is None:
             if not key_path or not os.path.exists(key_path):
                 logger.error(
                     "Google Vision API key path is not configured or file not found."
                 )
                 return None
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = key_path
-            gcv_client = vision.ImageAnnotatorClient()
+            # Passed to the client directly rather than through
+            # GOOGLE_APPLICATION_CREDENTIALS, which is process-wide.
+            credentials = service_account.Credentials.from_service_account_file(
+                key_path
+            )
+            gcv_client = vision.ImageAnnotatorClient(
+                credentials=credentials, transport="grpc"
+            )
             logger.info("Google Vision client initialized successfully.")
+    return gcv_client
+
+
+def _extract_text_with_google_vision(
+    image_path: str, key_path: Optional[str], limiter: Optional[GcvLimiter] = None
+) -> Optional[str]:
+    """
+    Uses Google Cloud Vision to get a single block of text from an image. The
+    request goes through `limiter`, if given.
+    """
+    try:
+        client = _get_gcv_client(key_path)
+        if client is None:
+            return None
 
         with open(image_path, "rb") as image_file:
             content = image_file.read()
         image = vision.Image(content=content)
-        response = gcv_client.text_detection(image=image)
-        if response.error.message:
-            raise Exception(response.error.message)
-        return response.full_text_annotation.text
+
+        def detect_text():
+            response = client.text_detection(image=image)
+            # Raised here so the limiter sees per-image quota errors too.
+            if response.error.message:
+                raise Exception(response.error.message)
+            return response
+
+        response = limiter.call(detect_text) if limiter else detect_text()
+        # The first annotation holds the whole detected text as one string.
+        if not response.text_annotations:
+            return None
+        return response.text_annotations[0].description
     except Exception as e:
         logger.error(f"Google Vision API failed for {image_path}: {e}")
         return None
 
 
+def _extract_text_with_google_vision_batch(
+    image_paths: List[str],
+    key_path: Optional[str],
+    limiter: Optional[GcvLimiter] = None,
+) -> List[Optional[str]]:
+    """
+    Uses Google Cloud Vision to get a single block of text from each of
+    several images, with one request per `GCV_MAX_BATCH_SIZE` images. Each
+    request goes through `limiter`, if given.
+
+    Returns:
+        List[Optional[str]]: The text of each image, or None where none was
+        found or the request failed, in the same order as `image_paths`.
+    """
+    results: List[Optional[str]] = [None] * len(image_paths)
+    try:
+        client = _get_gcv_client(key_path)
+    except Exception as e:
+        logger.error(f"Google Vision API failed for {', '.join(image_paths)}: {e}")
+        return results
+    if client is None:
+        return results
+
+    indices: List[int] = []
+    requests: List[vision.AnnotateImageRequest] = []
+    for index, image_path in enumerate(image_paths):
+        try:
+            with open(image_path, "rb") as image_file:
+                content = image_file.read()
+        except OSError as e:
+            logger.error(f"Google Vision API failed for {image_path}: {e}")
+            continue
+        indices.append(index)
+        requests.append(
+            vision.AnnotateImageRequest(
+                image=vision.Image(content=content),
+                features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)],
+            )
+        )
+
+    for start in range(0, len(requests), GCV_MAX_BATCH_SIZE):
+        batch_indices = indices[start : start + GCV_MAX_BATCH_SIZE]
+        batch_requests = requests[start : start + GCV_MAX_BATCH_SIZE]
+
+        def annotate_batch():
+            response = client.batch_annotate_images(requests=batch_requests)
+            # Raised here so the limiter retries the batch when any of its
+            # images was rejected for exceeding the quota.
+            for image_response in response.responses:
+                message = image_response.error.message
+                if message and is_rate_limit_error(Exception(message)):
+                    raise Exception(message)
+            return response
+
+        try:
+            response = limiter.call(annotate_batch) if limiter else annotate_batch()
+        except Exception as e:
+            paths = ", ".join(image_paths[index] for index in batch_indices)
+            logger.error(f"Google Vision API failed for {paths}: {e}")
+            continue
+        for index, image_response in zip(batch_indices, response.responses):
+            if image_response.error.message:
+                logger.error(
+                    f"Google Vision API failed for {image_paths[index]}: "
+                    f"{image_response.error.message}"
+                )
+            elif image_response.text_annotations:
+                # The first annotation holds the whole detected text as one string.
+                results[index] = image_response.text_annotations[0].description
+    return results
+
+
+def _gps_from_text_blocks(
+    raw_text_blocks: List[str], source_engine: str, ocr_input_path: str
+) -> Optional[Tuple[float, float, str]]:
+    """Parses the GPS coordinate from an image's OCR text, logging the outcome."""
+    if not raw_text_blocks:
+        logger.warning(f"{source_engine} could not find any text in {ocr_input_path}")
+        return None
+
+    # Log the OCR output for debugging and traceability
+    logger.info(f"{source_engine} OCR output for {ocr_input_path}: {raw_text_blocks}")
+    logger.debug(f"{source_engine} found text blocks: {raw_text_blocks}")
+
+    result = _parse_gps_from_texts(raw_text_blocks)
+    if result:
+        return result
+
+    logger.warning(
+        f"Could not find a valid GPS coordinate in any text from {source_engine} for {ocr_input_path}"
+    )
+    return None
+
+
 # --- Public API for the Workflow ---
 
 
@@ -206,16 +541,24 @@ def extract_gps_with_ocr(
     gcv_key_path: Optional[str],
     preprocess_method: str = "auto",
     debug_folder: str = None,
+    gcv_limiter: Optional[GcvLimiter] = None,
+    preprocessed: Optional[Tuple[Optional[str], np.ndarray]] = None,
 ) -> Optional[Tuple[float, float, str]]:
     """
     Main dispatcher function. Extracts GPS using the specified OCR engine.
-    """
-    from src.core.preprocess import preprocess_image
+    Google Vision requests are paced by `gcv_limiter`, if given.
 
-    # Preprocess image before OCR
-    preprocessed_path = preprocess_image(
-        image_path, method=preprocess_method, debug_folder=debug_folder
-    )
+    `preprocessed` is the image's `preprocess_image` result, if it was already
+    preprocessed (e.g. by `preprocess_stage`); otherwise it is done here.
+    """
+    if preprocessed is None:
+        from src.core.preprocess import preprocess_image
+
+        # Preprocess image before OCR
+        preprocessed = preprocess_image(
+            image_path, method=preprocess_method, debug_folder=debug_folder
+        )
+    preprocessed_path, preprocessed_img = preprocessed
     ocr_input_path = preprocessed_path if preprocessed_path else image_path
 
     raw_text_blocks: List[str] = []
@@ -223,29 +566,70 @@ def extract_gps_with_ocr(
 
     if engine == OCREngine.EASYOCR:
         source_engine = "EasyOCR"
-        blocks = _extract_text_with_easyocr(ocr_input_path)
+        # EasyOCR reads the preprocessed image from memory.
+        blocks = _extract_text_with_easyocr_from_array(preprocessed_img, ocr_input_path)
         if blocks:
             raw_text_blocks = blocks
     elif engine == OCREngine.GOOGLE:
         source_engine = "Google Vision"
-        full_text = _extract_text_with_google_vision(ocr_input_path, gcv_key_path)
+        full_text = _extract_text_with_google_vision(
+            ocr_input_path, gcv_key_path, gcv_limiter
+        )
         if full_text:
             raw_text_blocks = [full_text]
 
-    if not raw_text_blocks:
-        logger.warning(f"{source_engine} could not find any text in {ocr_input_path}")
-        return None
+    return _gps_from_text_blocks(raw_text_blocks, source_engine, ocr_input_path)
 
-    # Log the OCR output for debugging and traceability
-    logger.info(f"{source_engine} OCR output for {ocr_input_path}: {raw_text_blocks}")
-    logger.debug(f"{source_engine} found text blocks: {raw_text_blocks}")
 
-    for text_block in raw_text_blocks:
-        coords = _parse_gps_from_text(text_block)
-        if coords:
-            return coords[0], coords[1], text_block
+def extract_gps_with_ocr_batch(
+    image_paths: List[str],
+    engine: OCREngine,
+    gcv_key_path: Optional[str],
+    gcv_limiter: Optional[GcvLimiter] = None,
+    preprocessed: Optional[List[Tuple[Optional[str], np.ndarray]]] = None,
+) -> List[Optional[Tuple[float, float, str]]]:
+    """
+    Extracts GPS from several images with the specified OCR engine. Google
+    Vision is sent up to `GCV_MAX_BATCH_SIZE` images per request, paced by
+    `gcv_limiter`, if given; EasyOCR runs same-sized images together.
+
+    `preprocessed` holds the images' `preprocess_image` results (e.g. from
+    `preprocess_stage`). EasyOCR reads them from memory, so it needs them.
+    Google Vision is sent the saved preprocessed copies if there are any, and
+    otherwise the files as they are.
+
+    Returns:
+        List[Optional[Tuple[float, float, str]]]: The (lat, lon, raw_text) of
+        each image, or None where none was found, in the same order as
+        `image_paths`.
+    """
+    if not image_paths:
+        return []
+    if preprocessed is None:
+        if engine == OCREngine.EASYOCR:
+            raise ValueError("EasyOCR needs the preprocessed images.")
+        ocr_input_paths = image_paths
+    else:
+        ocr_input_paths = [
+            preprocessed_path or image_path
+            for image_path, (preprocessed_path, _) in zip(image_paths, preprocessed)
+        ]
 
-    logger.warning(
-        f"Could not find a valid GPS coordinate in any text from {source_engine} for {ocr_input_path}"
-    )
-    return None
+    if engine == OCREngine.EASYOCR:
+        source_engine = "EasyOCR"
+        blocks_per_image = [
+            blocks or []
+            for blocks in _extract_text_with_easyocr_from_arrays(
+                [img for _, img in preprocessed], ocr_input_paths
+            )
+        ]
+    else:
+        source_engine = "Google Vision"
+        texts = _extract_text_with_google_vision_batch(
+            ocr_input_paths, gcv_key_path, gcv_limiter
+        )
+        blocks_per_image = [[text] if text else [] for text in texts]
+    return [
+        _gps_from_text_blocks(blocks, source_engine, ocr_input_path)
+        for ocr_input_path, blocks in zip(ocr_input_paths, blocks_per_image)
+    ]
@@ -0,0 +1,137 @@
+# src/core/tlsh_distance.py
+"""
+All-pairs TLSH distance scoring, compiled with Numba.
+
+Reproduces `tlsh.diff` (header and body distance, including the length
+difference) on a decoded (N, 35) hash matrix, so large collections can be
+compared without a Python-level double loop.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+from numba import njit, prange
+
+# Decoded digest layout: checksum, L-value, Q-ratios, then 32 body bytes.
+TLSH_DIGEST_BYTES = 35
+_BODY_OFFSET = 3
+
+
+def _build_body_diff_table() -> np.ndarray:
+    """
+    Precomputes the body distance of every pair of body bytes. Each byte packs
+    four 2-bit quartile codes; codes 3 apart count as 6, as in the reference
+    implementation.
+    """
+    codes = np.arange(256)
+    table = np.zeros((256, 256), dtype=np.int64)
+    for shift in (0, 2, 4, 6):
+        quartile_diff = np.abs(
+            ((codes[:, None] >> shift) & 3) - ((codes[None, :] >> shift) & 3)
+        )
+        table += np.where(quartile_diff == 3, 6, quartile_diff)
+    return table
+
+
+_BODY_DIFF_TABLE = _build_body_diff_table()
+
+
+def decode_tlsh_digests(digests: Sequence[str]) -> np.ndarray:
+    """
+    Decodes TLSH hex digests (with or without the 'T1' version prefix) into an
+    (N, 35) uint8 matrix.
+    """
+    rows = [
+        np.frombuffer(bytes.fromhex(digest.removeprefix("T1")), dtype=np.uint8)
+        for digest in digests
+    ]
+    if not rows:
+        return np.empty((0, TLSH_DIGEST_BYTES), dtype=np.uint8)
+    return np.stack(rows)
+
+
+@njit(cache=True)
+def _mod_diff(x, y, value_range):
+    """Distance between two values on a circular scale of size `value_range`."""
+    if y > x:
+        return min(y - x, x + value_range - y)
+    return min(x - y, y + value_range - x)
+
+
+@njit(cache=True)
+def _tlsh_diff(a, b, body_table):
+    """Numba port of `tlsh.diff` for two decoded digests."""
+    # The L-value is stored nibble-swapped in the hex digest.
+    a_lvalue = ((a[1] & 0x0F) << 4) | (a[1] >> 4)
+    b_lvalue = ((b[1] & 0x0F) << 4) | (b[1] >> 4)
+    length_diff = _mod_diff(int(a_lvalue), int(b_lvalue), 256)
+    diff = length_diff if length_diff <= 1 else length_diff * 12
+
+    # Q1 and Q2 ratios share one byte, one per nibble.
+    for shift in (4, 0):
+        q_diff = _mod_diff(int((a[2] >> shift) & 0x0F), int((b[2] >> shift) & 0x0F), 16)
+        diff += q_diff if q_diff <= 1 else (q_diff - 1) * 12
+
+    if a[0] != b[0]:
+        diff += 1
+
+    for k in range(_BODY_OFFSET, TLSH_DIGEST_BYTES):
+        diff += body_table[a[k], b[k]]
+    return diff
+
+
+@njit(parallel=True, cache=True)
+def _count_similar_pairs(digests, threshold, body_table):
+    n = digests.shape[0]
+    counts = np.zeros(n, dtype=np.int64)
+    for i in prange(n):
+        count = 0
+        for j in range(i + 1, n):
+            if _tlsh_diff(digests[i], digests[j], body_table) <= threshold:
+                count += 1
+        counts[i] = count
+    return counts
+
+
+@njit(parallel=True, cache=True)
+def _fill_similar_pairs(digests, threshold, body_table, offsets, first, second, scores):
+    n = digests.shape[0]
+    for i in prange(n):
+        k = offsets[i]
+        for j in range(i + 1, n):
+            score = _tlsh_diff(digests[i], digests[j], body_table)
+            if score <= threshold:
+                first[k] = i
+                second[k] = j
+                scores[k] = score
+                k += 1
+
+
+def find_similar_pairs(
+    digests: np.ndarray, threshold: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compares every pair of decoded TLSH digests in parallel.
+
+    Args:
+        digests (np.ndarray): An (N, 35) uint8 matrix from `decode_tlsh_digests`.
+        threshold (int): The maximum difference score to report.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Row indices of the first and
+        second digest of each matching pair (first < second), and their scores.
+    """
+    # First pass sizes the output so the second pass can write each row's
+    # matches into its own preallocated slice without synchronisation.
+    counts = _count_similar_pairs(digests, threshold, _BODY_DIFF_TABLE)
+    offsets = np.zeros_like(counts)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    total = int(counts.sum())
+
+    first = np.empty(total, dtype=np.int64)
+    second = np.empty(total, dtype=np.int64)
+    scores = np.empty(total, dtype=np.int64)
+    _fill_similar_pairs(
+        digests, threshold, _BODY_DIFF_TABLE, offsets, first, second, scores
+    )
+    return first, second, scores
@@ -1,18 +1,55 @@
 # src/io/downloader.py
 import logging
 import os
-from typing import Optional
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 
 from src.config import settings
 
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
+# Copy buffer for streaming downloads to disk.
+_DOWNLOAD_BUFFER_SIZE = 1 << 20
+# Default number of concurrent downloads in `download_files`.
+_MAX_DOWNLOAD_WORKERS = 16
+# Concurrent downloads from any one host, so a single server is not flooded.
+_MAX_DOWNLOADS_PER_HOST = 4
 
-def is_url(path: str) -> bool:
-    """Checks if a given path string is a URL."""
-    return path.startswith(("http://", "https://"))
+# One session for all downloads, so connections (and TLS handshakes) to the
+# same host are reused. Its pool holds one connection per download thread.
+_session = requests.Session()
+_session.headers["User-Agent"] = settings.REQUESTS_USER_AGENT
+_adapter = HTTPAdapter(
+    pool_connections=_MAX_DOWNLOAD_WORKERS, pool_maxsize=_MAX_DOWNLOAD_WORKERS
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+# One semaphore per host, created on first use.
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+URL_PREFIXES = ("http://", "https://")
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """Returns the semaphore limiting concurrent downloads from `url`'s host."""
+    host = urlsplit(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(_MAX_DOWNLOADS_PER_HOST)
+            _host_semaphores[host] = semaphore
+        return semaphore
 
 
 def download_file(url: str, download_folder: str) -> Optional[str]:
@@ -33,15 +70,45 @@ def download_file(url: str, download_folder: str) -> Optional[str]:
         logger.info(f"File already exists, skipping download: {local_filename}")
         return local_filename
 
-    headers = {"User-Agent": settings.REQUESTS_USER_AGENT}
     try:
-        with requests.get(url, headers=headers, stream=True) as response:
+        with _host_semaphore(url), _session.get(url, stream=True) as response:
             response.raise_for_status()
+            # Let urllib3 undo any Content-Encoding, as iter_content would.
+            response.raw.decode_content = True
             with open(local_filename, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=_DOWNLOAD_BUFFER_SIZE)
         logger.info(f"Successfully downloaded {url} to {local_filename}")
         return local_filename
-    except requests.RequestException as e:
+    # Reading `response.raw` directly raises urllib3's errors unwrapped.
+    except (requests.RequestException, Urllib3HTTPError) as e:
         logger.error(f"Failed to download {url}: {e}")
         return None
+
+
+def download_files(
+    urls: List[str], download_folder: str, max_workers: int = _MAX_DOWNLOAD_WORKERS
+) -> List[Optional[str]]:
+    """
+    Downloads several files concurrently into a specified folder, with at
+    most a few downloads from the same host at a time.
+
+    Args:
+        urls (List[str]): The URLs of the files to download.
+        download_folder (str): The local directory to save the files in.
+        max_workers (int): The maximum number of simultaneous downloads.
+
+    Returns:
+        List[Optional[str]]: The local path of each downloaded file, or None on
+        failure, in the same order as `urls`.
+    """
+    # URLs that would be saved under the same name are fetched only once, so
+    # two threads never write the same file.
+    first_url_by_name: Dict[str, str] = {}
+    for url in urls:
+        first_url_by_name.setdefault(os.path.basename(url), url)
+    unique_urls = list(first_url_by_name.values())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        paths = executor.map(download_file, unique_urls, repeat(download_folder))
+        path_by_name = dict(zip(first_url_by_name, paths))
+    return [path_by_name[os.path.basename(url)] for url in urls]
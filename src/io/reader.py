@@ -0,0 +1,74 @@
+# src/io/reader.py
+import logging
+from typing import AbstractSet, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:  # Optional accelerator; see `read_csv_file`.
+    pyarrow = None
+
+try:
+    import python_calamine
+except ImportError:  # Optional accelerator; see `read_excel_file`.
+    python_calamine = None
+
+logger = logging.getLogger("GeoPhotoToolkitLogger")
+
+
+def read_csv_file(
+    input_file: str, columns: Optional[AbstractSet[str]] = None
+) -> pd.DataFrame:
+    """
+    Reads a CSV file into a DataFrame, with PyArrow's multithreaded parser if
+    installed.
+
+    Args:
+        input_file (str): The CSV file to read.
+        columns (Optional[AbstractSet[str]]): The columns to read, if not all.
+            Names the file does not have are ignored.
+
+    Returns:
+        pd.DataFrame: The file's data, with columns in file order.
+    """
+    usecols = None
+    if columns is not None:
+        header = pd.read_csv(input_file, nrows=0).columns
+        usecols = [column for column in header if column in columns]
+    if pyarrow is None:
+        return pd.read_csv(input_file, usecols=usecols)
+
+    df = pd.read_csv(input_file, engine="pyarrow", usecols=usecols)
+    # PyArrow parses ISO-formatted dates, which pandas' own parser leaves as
+    # text; re-read those columns with the latter so the values are unchanged.
+    date_columns = [
+        column
+        for column, dtype in df.dtypes.items()
+        if pd.api.types.is_datetime64_any_dtype(dtype)
+    ]
+    if date_columns:
+        df[date_columns] = pd.read_csv(input_file, usecols=date_columns)
+    return df
+
+
+def read_excel_file(
+    input_file: str, columns: Optional[AbstractSet[str]] = None
+) -> pd.DataFrame:
+    """
+    Reads the first sheet of an Excel file into a DataFrame, with the Calamine
+    engine if python-calamine is installed (much faster than openpyxl).
+
+    Args:
+        input_file (str): The .xlsx file to read.
+        columns (Optional[AbstractSet[str]]): The columns to read, if not all.
+            Names the file does not have are ignored.
+
+    Returns:
+        pd.DataFrame: The sheet's data, with columns in sheet order.
+    """
+    return pd.read_excel(
+        input_file,
+        engine="calamine" if python_calamine is not None else None,
+        usecols=(lambda column: column in columns) if columns is not None else None,
+    )
@@ -1,20 +1,52 @@
 # src/io/writer.py
+import csv
 import logging
+import math
+import numbers
 import os
+from typing import Any, Iterable, Sequence
 
-import pandas as pd
+import xlsxwriter
 
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
+# Write buffer for streamed CSV output.
+_CSV_BUFFER_SIZE = 1 << 20
 
-def write_dataframe_to_excel(
-    df: pd.DataFrame, output_folder: str, filename: str
+# Matches the header style of pandas' `to_excel`.
+_EXCEL_HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+
+def _excel_cell_value(value: Any) -> Any:
+    """
+    Converts a row value into one Excel can store, as pandas does:
+    numbers stay numeric, other objects (e.g. raw EXIF bytes) become text, and
+    missing values become None (an empty cell).
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, (str, bool)):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    return str(value)
+
+
+def write_rows_to_excel(
+    rows: Iterable[Sequence[Any]],
+    header: Sequence[str],
+    output_folder: str,
+    filename: str,
 ) -> None:
     """
-    Saves a pandas DataFrame to an Excel file.
+    Streams rows to an Excel file without building a DataFrame first.
 
     Args:
-        df (pd.DataFrame): The DataFrame to save, with columns already in order.
+        rows (Iterable[Sequence[Any]]): The rows to save, with values in the
+            same order as `header`. None and NaN are written as empty cells.
+        header (Sequence[str]): The column names.
         output_folder (str): The directory to save the Excel file in.
         filename (str): The name of the output Excel file.
     """
@@ -22,19 +54,44 @@ def write_dataframe_to_excel(
     output_path = os.path.join(output_folder, filename)
 
     try:
-        df.to_excel(output_path, index=False, header=True)
+        # XlsxWriter's constant_memory mode flushes each row to disk as soon as
+        # the next one starts, instead of keeping the whole workbook in memory.
+        # It needs cells in row order, which `df.to_excel` does not produce.
+        with xlsxwriter.Workbook(
+            output_path,
+            {
+                "constant_memory": True,
+                # Store every string as text, as before.
+                "strings_to_urls": False,
+                "strings_to_formulas": False,
+                "nan_inf_to_errors": True,
+            },
+        ) as workbook:
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(
+                0, 0, list(header), workbook.add_format(_EXCEL_HEADER_FORMAT)
+            )
+            for row_number, row in enumerate(rows, 1):
+                worksheet.write_row(row_number, 0, [_excel_cell_value(v) for v in row])
         logger.info(f"Successfully saved data to Excel file: {output_path}")
     except Exception as e:
         logger.error(f"Could not write to Excel file {output_path}: {e}")
         raise
 
 
-def write_dataframe_to_csv(df: pd.DataFrame, output_folder: str, filename: str) -> None:
+def write_rows_to_csv(
+    rows: Iterable[Sequence[Any]],
+    header: Sequence[str],
+    output_folder: str,
+    filename: str,
+) -> None:
     """
-    Saves a pandas DataFrame to a CSV file.
+    Streams rows to a CSV file without building a DataFrame first.
 
     Args:
-        df (pd.DataFrame): The DataFrame to save, with columns already in order.
+        rows (Iterable[Sequence[Any]]): The rows to save, with values in the
+            same order as `header`. None and NaN are written as empty fields.
+        header (Sequence[str]): The column names.
         output_folder (str): The directory to save the CSV file in.
         filename (str): The name of the output CSV file.
     """
@@ -42,7 +99,19 @@ def write_dataframe_to_csv(df: pd.DataFrame, output_folder: str, filename: str)
     output_path = os.path.join(output_folder, filename)
 
     try:
-        df.to_csv(output_path, index=False, header=True)
+        with open(
+            output_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE
+        ) as f:
+            # Same line endings as `df.to_csv`.
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(header)
+            writer.writerows(
+                [
+                    None if isinstance(value, float) and math.isnan(value) else value
+                    for value in row
+                ]
+                for row in rows
+            )
         logger.info(f"Successfully saved data to CSV file: {output_path}")
     except Exception as e:
         logger.error(f"Could not write to CSV file {output_path}: {e}")
@@ -1,25 +1,93 @@
 # src/utils/config_loader.py
+import functools
 import os
-from typing import Any, Dict, Optional
-
 import tomllib  # For Python 3.11+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Recursively converts dicts to read-only mappings and lists to tuples.
+    Mappings that are already read-only are left as they are.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=8)
+def _load_toml_cached(path: str, mtime_ns: int) -> Mapping:
+    """
+    Parses a TOML file. The result is shared between callers, so it is frozen
+    to stop anyone from mutating the cached copy. `mtime_ns` is only part of the
+    cache key, so that editing the file invalidates the cached result.
+    """
+    with open(path, "rb") as f:
+        return _freeze(tomllib.load(f))
 
 
-def deep_merge(base: Dict, override: Dict) -> Dict:
+def _config_file_key(path: str) -> Optional[Tuple[str, int]]:
+    """
+    Returns the absolute path and modification time of a config file, or None
+    if it does not exist. This identifies the file's current contents for the
+    caches above and below.
+    """
+    path = os.path.abspath(path)
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def deep_merge(base: Mapping, override: Mapping) -> Dict:
     """
     Recursively merges two dictionaries.
     Override values take precedence over base values.
+
+    Nested tables are merged iteratively; only the levels that are actually
+    merged are copied, and the inputs are never modified.
     """
-    result = base.copy()
-    for key, value in override.items():
-        if isinstance(value, dict) and key in result and isinstance(result[key], dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
+    result = dict(base)
+    pending = [(result, override)]
+    while pending:
+        target, source = pending.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(value, Mapping) and isinstance(current, Mapping):
+                merged = dict(current)
+                target[key] = merged
+                pending.append((merged, value))
+            else:
+                target[key] = value
     return result
 
 
-def load_config(task_config_path: Optional[str] = None) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(
+    global_key: Optional[Tuple[str, int]], task_key: Optional[Tuple[str, int]]
+) -> Mapping[str, Any]:
+    """
+    Merges the two config files identified by `_config_file_key`. Like the
+    parsed files, the result is shared between callers, so it is frozen too.
+    """
+    # Start with the global config as the base
+    final_config = {}
+    if global_key:
+        final_config = _load_toml_cached(*global_key)
+
+    # Merge task config over the global config
+    if task_key:
+        final_config = deep_merge(final_config, _load_toml_cached(*task_key))
+
+    # `deep_merge` copies the tables it merges into plain dicts.
+    return _freeze(final_config)
+
+
+def load_config(task_config_path: Optional[str] = None) -> Mapping[str, Any]:
     """
     Loads configuration by merging a global config with an optional task-specific config.
 
@@ -28,29 +96,21 @@ def load_config(task_config_path: Optional[str] = None) -> Dict[str, Any]:
     3. The task-specific config is merged on top of the global config, overriding any
        duplicate settings.
 
+    The merged result is reused until either file changes.
+
     Returns:
-        A dictionary containing the final merged configuration.
+        A read-only mapping containing the final merged configuration.
     """
     # Assume the script is run from the project root
     project_root = os.getcwd()
-    global_config_path = os.path.join(project_root, "global_config.toml")
-
-    # Start with the global config as the base
-    final_config = {}
-    if os.path.exists(global_config_path):
-        with open(global_config_path, "rb") as f:
-            final_config = tomllib.load(f)
+    global_key = _config_file_key(os.path.join(project_root, "global_config.toml"))
 
-    # If a task-specific config is provided, load and merge it
+    task_key = None
     if task_config_path:
-        if not os.path.exists(task_config_path):
+        task_key = _config_file_key(task_config_path)
+        if task_key is None:
             raise FileNotFoundError(
                 f"Specified config file not found: {task_config_path}"
             )
-        with open(task_config_path, "rb") as f:
-            task_config = tomllib.load(f)
-
-        # Merge task config over the global config
-        final_config = deep_merge(final_config, task_config)
 
-    return final_config
+    return _load_config_cached(global_key, task_key)
@@ -0,0 +1,130 @@
+# src/utils/exif_cache.py
+"""
+On-disk cache of `extract_exif_data` results, so re-running the GPS workflow
+on the same photos only reads the files that changed.
+
+Entries are keyed by the file's absolute path and the EXIF schema, and are
+only used while the file's modification time and size are unchanged.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import settings
+from src.core.exif import ExifSchema
+
+logger = logging.getLogger("GeoPhotoToolkitLogger")
+
+EXIF_CACHE_FILE_NAME = "exif.db"
+
+# Bump when `extract_exif_data` changes what it returns for the same file.
+_CACHE_VERSION = 1
+
+# Values aligned with the schema, or None for a file without EXIF data.
+ExifValues = Optional[Tuple[Any, ...]]
+
+
+def _schema_key(schema: ExifSchema) -> str:
+    """Hashes the schema, so changing the configured columns misses the cache."""
+    return hashlib.blake2b(
+        repr((_CACHE_VERSION, schema)).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+class ExifCache:
+    """
+    A SQLite-backed cache of EXIF values for one schema. If the cache file
+    cannot be opened, every lookup misses and nothing is stored.
+
+    Args:
+        schema (ExifSchema): The schema the cached values are aligned with.
+        path (Optional[str]): The cache file. Defaults to `exif.db` in
+            `settings.CACHE_DIR`.
+    """
+
+    def __init__(self, schema: ExifSchema, path: Optional[str] = None):
+        self._schema_key = _schema_key(schema)
+        self._path = path or os.path.join(settings.CACHE_DIR, EXIF_CACHE_FILE_NAME)
+        # (mtime_ns, size) of each file looked up, reused when storing.
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            self._conn: Optional[sqlite3.Connection] = sqlite3.connect(self._path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS exif ("
+                " path TEXT NOT NULL, schema_key TEXT NOT NULL,"
+                " mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL,"
+                " value BLOB NOT NULL, PRIMARY KEY (path, schema_key))"
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"EXIF cache unavailable at {self._path}: {e}")
+            self._conn = None
+
+    def get_many(self, image_paths: List[str]) -> Dict[int, ExifValues]:
+        """
+        Looks up many files at once.
+
+        Returns:
+            Dict[int, ExifValues]: The cached values of the files that hit,
+            keyed by their index in `image_paths`.
+        """
+        hits: Dict[int, ExifValues] = {}
+        if self._conn is None:
+            return hits
+        for index, image_path in enumerate(image_paths):
+            abs_path = os.path.abspath(image_path)
+            try:
+                st = os.stat(abs_path)
+                self._file_stats[abs_path] = (st.st_mtime_ns, st.st_size)
+                entry = self._conn.execute(
+                    "SELECT mtime_ns, size, value FROM exif"
+                    " WHERE path = ? AND schema_key = ?",
+                    (abs_path, self._schema_key),
+                ).fetchone()
+            except OSError:
+                continue
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read the EXIF cache at {self._path}: {e}")
+                break
+            if entry and (entry[0], entry[1]) == (st.st_mtime_ns, st.st_size):
+                try:
+                    hits[index] = pickle.loads(entry[2])
+                except Exception:
+                    # Unreadable entry (e.g. from another Pillow version).
+                    continue
+        return hits
+
+    def put_many(self, entries: Iterable[Tuple[str, ExifValues]]) -> None:
+        """
+        Stores (image_path, values) pairs. Only files looked up with
+        `get_many` are stored, with the file state seen at lookup time.
+        """
+        if self._conn is None:
+            return
+        try:
+            records = []
+            for image_path, values in entries:
+                abs_path = os.path.abspath(image_path)
+                file_stat = self._file_stats.get(abs_path)
+                if file_stat is not None:
+                    records.append(
+                        (abs_path, self._schema_key, *file_stat, pickle.dumps(values))
+                    )
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO exif"
+                    " (path, schema_key, mtime_ns, size, value)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    records,
+                )
+        except (sqlite3.Error, pickle.PicklingError, TypeError) as e:
+            logger.warning(f"Could not update the EXIF cache at {self._path}: {e}")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
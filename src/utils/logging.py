@@ -1,6 +1,18 @@
 # src/utils/logging.py
+import atexit
 import logging
+import multiprocessing
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Union
+
+# The console handler, owned by the listener threads started below.
+_console_handler: Optional[logging.Handler] = None
+# Process-safe queue for worker processes' records; see `get_log_queue`.
+_worker_log_queue: Optional[multiprocessing.Queue] = None
+_worker_log_queue_lock = threading.Lock()
 
 
 def setup_logging(log_level: str = "INFO") -> logging.Logger:
@@ -11,12 +23,17 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     (e.g., "INFO", "DEBUG"). It ensures that all parts of the application
     use a consistent logging format and destination.
 
+    Records are written to the console by a background listener thread, so
+    logging inside per-image loops only costs a queue put.
+
     Args:
         log_level (str): The desired logging level. Defaults to "INFO".
 
     Returns:
         logging.Logger: The configured logger instance.
     """
+    global _console_handler
+
     # Get the root logger for the application.
     # Naming it ensures we can get the same instance from anywhere in the app.
     logger = logging.getLogger("GeoPhotoToolkitLogger")
@@ -33,8 +50,56 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
             datefmt="%Y-%m-%d %H:%M:%S",
         )
         handler.setFormatter(formatter)
+        _console_handler = handler
+
+        # The handler does the actual I/O on the listener's thread.
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        # Flush any queued records on shutdown.
+        atexit.register(listener.stop)
 
-        # Add the configured handler to the logger.
-        logger.addHandler(handler)
+        # Add the queue handler to the logger.
+        logger.addHandler(QueueHandler(log_queue))
 
     return logger
+
+
+def get_log_queue() -> Optional[multiprocessing.Queue]:
+    """
+    Returns a queue through which worker processes can log to the console set
+    up by `setup_logging`, creating it (and its listener) on first use. Returns
+    None if `setup_logging` was not called.
+    """
+    global _worker_log_queue
+    if _console_handler is None:
+        return None
+    with _worker_log_queue_lock:
+        if _worker_log_queue is None:
+            # One created for "spawn" can be passed to pools using any start
+            # method.
+            _worker_log_queue = multiprocessing.get_context("spawn").Queue()
+            listener = QueueListener(
+                _worker_log_queue, _console_handler, respect_handler_level=True
+            )
+            listener.start()
+            atexit.register(listener.stop)
+    return _worker_log_queue
+
+
+def setup_worker_logging(
+    log_queue: Optional[multiprocessing.Queue], log_level: Union[int, str]
+) -> None:
+    """
+    Routes a worker process's log records to the main process's listener.
+    Intended as (part of) a process pool `initializer`.
+
+    Args:
+        log_queue: The queue returned by `get_log_queue` in the main process.
+        log_level: The level of the main process's logger.
+    """
+    if log_queue is None:
+        return
+    logger = logging.getLogger("GeoPhotoToolkitLogger")
+    logger.setLevel(log_level)
+    logger.handlers = [QueueHandler(log_queue)]
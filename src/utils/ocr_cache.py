@@ -0,0 +1,124 @@
+# src/utils/ocr_cache.py
+"""
+On-disk cache of OCR results, so an image is only OCRed once, even when it
+is re-run or appears again under another name or folder.
+
+Entries are keyed by a hash of the file's contents, the OCR engine and the
+preprocessing method. Only images in which a GPS coordinate was found are
+cached, so failed requests are retried on the next run.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+from src.config import OCREngine, settings
+
+logger = logging.getLogger("GeoPhotoToolkitLogger")
+
+OCR_CACHE_FILE_NAME = "ocr.sqlite"
+
+# Bump when the OCR parsing changes what it returns for the same image.
+_CACHE_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+# (lat, lon, raw_text), as returned by `extract_gps_with_ocr`.
+OcrResult = Tuple[float, float, str]
+
+
+def hash_file_contents(file_path: str) -> Optional[str]:
+    """Hashes a file's bytes for `OcrCache`; returns None if it cannot be read."""
+    file_hash = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file_path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+    except OSError as e:
+        logger.warning(f"Could not hash {file_path} for the OCR cache: {e}")
+        return None
+    return file_hash.hexdigest()
+
+
+class OcrCache:
+    """
+    A SQLite-backed cache of OCR results, safe to share between threads. If
+    the cache file cannot be opened, every lookup misses and nothing is stored.
+
+    Args:
+        path (Optional[str]): The cache file. Defaults to `ocr.sqlite` in
+            `settings.CACHE_DIR`.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.join(settings.CACHE_DIR, OCR_CACHE_FILE_NAME)
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+                self._path, check_same_thread=False
+            )
+            # Results of an older version are dropped rather than reused.
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != _CACHE_VERSION:
+                with self._conn:
+                    self._conn.execute("DROP TABLE IF EXISTS ocr")
+                    self._conn.execute(f"PRAGMA user_version = {_CACHE_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr ("
+                " content_hash TEXT NOT NULL, engine TEXT NOT NULL,"
+                " preprocess_method TEXT NOT NULL,"
+                " lat REAL NOT NULL, lon REAL NOT NULL, raw_text TEXT NOT NULL,"
+                " PRIMARY KEY (content_hash, engine, preprocess_method))"
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"OCR cache unavailable at {self._path}: {e}")
+            self._conn = None
+
+    def get(
+        self, content_hash: str, engine: OCREngine, preprocess_method: str
+    ) -> Optional[OcrResult]:
+        """Returns the cached result for an image, or None on a miss."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                entry = self._conn.execute(
+                    "SELECT lat, lon, raw_text FROM ocr"
+                    " WHERE content_hash = ? AND engine = ? AND preprocess_method = ?",
+                    (content_hash, engine.value, preprocess_method),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read the OCR cache at {self._path}: {e}")
+            return None
+        return tuple(entry) if entry else None
+
+    def put(
+        self,
+        content_hash: str,
+        engine: OCREngine,
+        preprocess_method: str,
+        result: OcrResult,
+    ) -> None:
+        """Stores the result of OCRing an image."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ocr"
+                    " (content_hash, engine, preprocess_method, lat, lon, raw_text)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (content_hash, engine.value, preprocess_method, *result),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update the OCR cache at {self._path}: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,18 +1,90 @@
 # src/workflows/gps_extraction.py
+import contextlib
 import logging
+import math
 import os
-from typing import Any, Dict, List
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import pandas as pd
-
-from src.config import OCREngine
-from src.core.exif import extract_exif_data
-from src.core.ocr import extract_gps_with_ocr
-from src.io.writer import write_dataframe_to_csv, write_dataframe_to_excel
+from src.config import OCREngine, settings
+from src.core.exif import (
+    GPS_COORDINATE_TAGS,
+    ExifSchema,
+    build_exif_schema,
+    build_needed_tag_ids,
+    convert_dms_to_dd,
+    extract_exif_data,
+)
+from src.io.writer import write_rows_to_csv, write_rows_to_excel
 from src.utils.config_loader import load_config
+from src.utils.exif_cache import ExifCache
+from src.utils.logging import get_log_queue, setup_worker_logging
+from src.utils.ocr_cache import OcrCache, OcrResult, hash_file_contents
+
+if TYPE_CHECKING:
+    from src.core.preprocess import PreprocessedImage
 
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
+_IMG_EXT = frozenset(settings.IMAGE_EXTENSIONS)
+# Images per EXIF task; also how many rows are converted to decimal degrees
+# at a time.
+_EXIF_CHUNK_SIZE = 64
+# Below this many uncached images, EXIF is read in this process, as starting
+# the worker pool costs more than it saves.
+_EXIF_POOL_MIN_IMAGES = 4 * _EXIF_CHUNK_SIZE
+# Concurrent EasyOCR calls. Each one already spreads its model inference over
+# every core, so more threads would only oversubscribe them; a second one
+# overlaps a batch's inference with the next batch's cache lookups and any
+# Google Vision fallback.
+_EASYOCR_MAX_WORKERS = 2
+
+# Per-process state of the EXIF worker pool, set once per worker by
+# `_init_exif_worker` instead of being pickled along with every task.
+_worker_schema: ExifSchema = ()
+_worker_needed_ids: FrozenSet[int] = frozenset()
+
+
+def _init_exif_worker(
+    schema: ExifSchema,
+    needed_ids: FrozenSet[int],
+    log_queue: Optional[Any],
+    log_level: Union[int, str],
+) -> None:
+    """Process pool initializer: sets up logging and the EXIF tag settings."""
+    global _worker_schema, _worker_needed_ids
+    setup_worker_logging(log_queue, log_level)
+    _worker_schema = schema
+    _worker_needed_ids = needed_ids
+
+
+def _extract_exif_in_worker(image_path: str) -> Optional[Tuple[Any, ...]]:
+    """Runs `extract_exif_data` with the settings installed by `_init_exif_worker`."""
+    return extract_exif_data(image_path, _worker_schema, _worker_needed_ids)
+
+
+def _convert_gps_columns(rows: List[List[Any]], column_indices: List[int]) -> None:
+    """
+    Converts the GPS coordinates in the given columns of `rows` from DMS to
+    decimal degrees, in a single pass per column.
+    """
+    for i in column_indices:
+        rows_with_gps = [row for row in rows if row[i] is not None]
+        dd_values = convert_dms_to_dd([row[i] for row in rows_with_gps])
+        for row, dd in zip(rows_with_gps, dd_values.tolist()):
+            row[i] = dd
+
 
 def run_gps_extraction_workflow(
     input_dir,
@@ -26,18 +98,31 @@ def run_gps_extraction_workflow(
     no_ocr_on_invalid_gps=False,
     preprocess_method="auto",
     save_preprocessed=False,
+    use_cache=True,
 ):
     """
     Main workflow to extract GPS data, with tiered OCR and configurable logic.
+    EXIF data of files unchanged since an earlier run, and OCR results of
+    images with the same contents as one OCRed before, are read from caches
+    unless `use_cache` is False.
     """
     logger.info("--- Starting GPS Extraction Workflow ---")
+
+    # Check the output path before any images are processed, so a bad path
+    # does not throw away a long EXIF and OCR run.
+    output_folder, output_filename = os.path.split(output_file)
+    output_folder = output_folder or "."
+    file_extension = os.path.splitext(output_filename)[1].lower()
+    if file_extension not in (".csv", ".xlsx"):
+        logger.error(
+            f"Unsupported output file format: '{file_extension}'. Please use '.csv' or '.xlsx'."
+        )
+        raise ValueError("Unsupported file format")
+    os.makedirs(output_folder, exist_ok=True)
+
     debug_folder = None
     if save_preprocessed:
         debug_folder = os.path.join(input_dir, "_preprocessed_debug")
-    # Example loop for preprocessing each image before OCR
-    # for image_path in image_list:
-    #     preprocessed_path = preprocess_image(image_path, method=preprocess_method, debug_folder=debug_folder)
-    #     # Use preprocessed_path for OCR
     if ocr_disabled:
         logger.info("Mode: EXIF-only. OCR fallback is completely disabled.")
     else:
@@ -55,149 +140,471 @@ def run_gps_extraction_workflow(
     # 1. Load configuration
     try:
         config = load_config(config_path)
-        tags_to_extract = config.get("extract", {}).get("columns", {})
-        gcv_key_path = config.get("google_cloud", {}).get("service_account_key_path")
+        # Frozen into plain tuples, as the cached config is read-only and the
+        # worker processes need something picklable.
+        schema = build_exif_schema(config.get("extract", {}).get("columns", {}))
+        gcv_config = config.get("google_cloud", {})
+        gcv_key_path = gcv_config.get("service_account_key_path")
     except Exception as e:
         logger.error(f"Failed to load or parse configuration: {e}")
         return
 
     # 2. Process images
-    gcv_processed_count = 0
-    all_image_data: List[Dict[str, Any]] = []
-    image_files = [
-        f
-        for f in os.listdir(input_dir)
-        if f.lower().endswith((".png", ".jpg", ".jpeg"))
+    with os.scandir(input_dir) as entries:
+        image_entries = [
+            (e.name, e.path)
+            for e in entries
+            if os.path.splitext(e.name)[1].lower() in _IMG_EXT and e.is_file()
+        ]
+    image_files = [name for name, _ in image_entries]
+    # Resolved once; the full path of each image is this plus its name.
+    abs_input_dir = os.path.abspath(input_dir)
+    image_paths = [path for _, path in image_entries]
+
+    # Each output row is a list of the schema's values followed by the extra
+    # columns added below, so the output is written from rows in one step.
+    exif_columns = [friendly_name for friendly_name, _ in schema]
+    row_columns = exif_columns + [
+        column
+        for column in ("name", "maps_url", "photo_path")
+        if column not in exif_columns
     ]
+    column_index = {column: i for i, column in enumerate(row_columns)}
+    lat_index = column_index.get("lat")
+    lon_index = column_index.get("lon")
+    empty_exif = (None,) * len(exif_columns)
+    padding = [None] * (len(row_columns) - len(exif_columns))
+    gps_column_indices = [
+        i
+        for i, (_, exif_tag_name) in enumerate(schema)
+        if exif_tag_name in GPS_COORDINATE_TAGS
+    ]
+
+    # Google Vision requests from all threads share one limiter, so they stay
+    # within the API's rate limits.
+    gcv_limiter = None
+    if not ocr_disabled and (ocr_engine == OCREngine.GOOGLE or gcv_fallback):
+        from src.core.gcv_limiter import GcvLimiter
+
+        gcv_limiter = GcvLimiter(
+            max_in_flight=gcv_config.get("max_concurrent_requests", 8),
+            requests_per_second=gcv_config.get("requests_per_second", 10.0),
+        )
+
+    # EasyOCR reads the preprocessed images from memory. Google Vision reads
+    # image files, so images are only preprocessed for it when the results
+    # are saved for it to read.
+    preprocess_for_ocr = ocr_engine == OCREngine.EASYOCR or bool(debug_folder)
 
-    for filename in image_files:
-        full_path = os.path.join(input_dir, filename)
-        image_data = extract_exif_data(full_path, tags_to_extract)
+    # Google Vision calls are counted against `gcv_limit` across all threads;
+    # a call is reserved before it is made.
+    gcv_lock = threading.Lock()
+    gcv_processed_count = 0
 
-        if not image_data:
-            image_data = {}
+    def _reserve_gcv_call() -> bool:
+        nonlocal gcv_processed_count
+        with gcv_lock:
+            if gcv_limit != -1 and gcv_processed_count >= gcv_limit:
+                return False
+            gcv_processed_count += 1
+            return True
 
-        gps_tags_present = (
-            image_data.get("lat") is not None or image_data.get("lon") is not None
+    # OCR results are cached by image contents, so duplicate photos and
+    # re-runs cost neither Google Vision quota nor EasyOCR time.
+    ocr_cache = OcrCache() if use_cache and not ocr_disabled else None
+
+    def _cached_ocr(
+        content_hash: Optional[str], engine: OCREngine
+    ) -> Optional[OcrResult]:
+        if ocr_cache is None or content_hash is None:
+            return None
+        return ocr_cache.get(content_hash, engine, preprocess_method)
+
+    def _store_ocr_result(
+        content_hash: Optional[str],
+        engine: OCREngine,
+        ocr_result: Optional[OcrResult],
+    ) -> None:
+        if ocr_result and ocr_cache is not None and content_hash is not None:
+            ocr_cache.put(content_hash, engine, preprocess_method, ocr_result)
+
+    def _run_ocr(
+        full_path: str,
+        engine: OCREngine,
+        content_hash: Optional[str],
+        preprocessed: "Optional[PreprocessedImage]",
+    ) -> Optional[OcrResult]:
+        """Runs `extract_gps_with_ocr`, storing a found coordinate in the cache."""
+        ocr_result = extract_gps_with_ocr(
+            full_path,
+            engine,
+            gcv_key_path if engine == OCREngine.GOOGLE else None,
+            preprocess_method=preprocess_method,
+            debug_folder=debug_folder,
+            gcv_limiter=gcv_limiter,
+            preprocessed=preprocessed,
         )
-        has_valid_gps = gps_tags_present and not (
-            image_data.get("lat") == 0.0 and image_data.get("lon") == 0.0
+        _store_ocr_result(content_hash, engine, ocr_result)
+        return ocr_result
+
+    def _read_gps(row: List[Any]) -> Tuple[Any, Any, bool, bool]:
+        """Returns a row's (lat, lon, gps_tags_present, has_valid_gps)."""
+        lat = row[lat_index] if lat_index is not None else None
+        lon = row[lon_index] if lon_index is not None else None
+
+        gps_tags_present = lat is not None or lon is not None
+        has_valid_gps = gps_tags_present and not (lat == 0.0 and lon == 0.0)
+        return lat, lon, gps_tags_present, has_valid_gps
+
+    def _needs_ocr(row: List[Any]) -> bool:
+        """Whether a row's image is OCRed, by `_process_ocr_batch`."""
+        _, _, gps_tags_present, has_valid_gps = _read_gps(row)
+        return (
+            not has_valid_gps
+            and not ocr_disabled
+            and not (no_ocr_on_invalid_gps and gps_tags_present)
+        )
+
+    def _process_without_ocr(filename: str, row: List[Any]) -> List[Any]:
+        """Finalizes the row of an image that is not OCRed."""
+        lat, lon, gps_tags_present, has_valid_gps = _read_gps(row)
+        if (
+            not has_valid_gps
+            and not ocr_disabled
+            and no_ocr_on_invalid_gps
+            and gps_tags_present
+        ):
+            logger.warning(
+                f"Found invalid/corrupt EXIF GPS for {filename}. "
+                "Skipping OCR fallback as per user setting."
+            )
+        return _finalize_row(filename, row, lat, lon)
+
+    def _apply_ocr_result(
+        filename: str,
+        row: List[Any],
+        lat: Any,
+        lon: Any,
+        ocr_result: Optional[OcrResult],
+        source_engine: str,
+    ) -> Tuple[Any, Any]:
+        """
+        Stores an image's OCR result, if any, in its row and logs the outcome.
+        Returns the (lat, lon) to use for the row from then on.
+        """
+        if not ocr_result:
+            logger.warning(f"All OCR attempts failed for {filename}.")
+            return lat, lon
+        lat, lon, raw_text = ocr_result
+        if lat_index is not None:
+            row[lat_index] = lat
+        if lon_index is not None:
+            row[lon_index] = lon
+        logger.info(
+            f"Successfully extracted GPS via {source_engine} for {filename}. "
+            f"Raw: '{raw_text}' -> Converted: ({lat:.6f}, {lon:.6f})"
         )
+        return lat, lon
+
+    def _finalize_row(filename: str, row: List[Any], lat: Any, lon: Any) -> List[Any]:
+        """Fills in a row's name, Maps link and (optionally) full path."""
+        row[column_index["name"]] = filename
+        if lat is not None and lon is not None:
+            row[column_index["maps_url"]] = (
+                f"https://www.google.com/maps/search/?api=1&query={lat},{lon}"
+            )
+        if include_full_path:
+            row[column_index["photo_path"]] = os.path.join(abs_input_dir, filename)
+        return row
+
+    def _skip_unpreprocessed(i: int) -> None:
+        """
+        Finalizes the row of an image that could not be preprocessed, without
+        OCR coordinates. `preprocess_stage` has already logged the error.
+        """
+        filename = image_files[i]
+        logger.warning(f"Skipping OCR for {filename}, as it could not be preprocessed.")
+        lat, lon, _, _ = _read_gps(rows[i])
+        _finalize_row(filename, rows[i], lat, lon)
 
-        # --- REFACTORED LOGIC WITH MASTER SWITCH ---
-        if not has_valid_gps and not ocr_disabled:
-            if no_ocr_on_invalid_gps and gps_tags_present:
+    def _gcv_fallback(
+        i: int,
+        content_hash: Optional[str],
+        preprocessed: "Optional[PreprocessedImage]",
+    ) -> Tuple[Optional[OcrResult], str]:
+        """
+        Runs the Google Vision fallback for an image in which EasyOCR found no
+        GPS. Returns the OCR result, if any, and the engine that produced it.
+        """
+        filename = image_files[i]
+        ocr_result = _cached_ocr(content_hash, OCREngine.GOOGLE)
+        if ocr_result:
+            return ocr_result, "Google Vision (Fallback, cached)"
+        if not _reserve_gcv_call():
+            logger.warning(
+                f"Google Vision limit reached. Skipping fallback for {filename}."
+            )
+            return None, ""
+        logger.info(f"EasyOCR failed for {filename}. Trying Google Vision fallback...")
+        ocr_result = _run_ocr(
+            image_paths[i], OCREngine.GOOGLE, content_hash, preprocessed
+        )
+        return ocr_result, "Google Vision (Fallback)"
+
+    def _process_ocr_batch(
+        batch: "List[Tuple[int, Optional[PreprocessedImage]]]",
+    ) -> None:
+        """
+        Runs OCR on a batch of images that need it and finalizes their rows:
+        the primary engine first, then the Google Vision fallback, if enabled.
+        Images not found in the cache go to the primary engine together (see
+        `extract_gps_with_ocr_batch`). `batch` holds each image's index and
+        its preprocessing result, if it was preprocessed.
+        """
+        source_engine = "Google Vision" if ocr_engine == OCREngine.GOOGLE else "EasyOCR"
+        outcomes = {}
+        content_hashes = {}
+        to_ocr: "List[Tuple[int, Optional[PreprocessedImage]]]" = []
+        for i, preprocessed in batch:
+            filename = image_files[i]
+            logger.info(
+                f"No valid EXIF GPS for {filename}. Attempting OCR with {ocr_engine.value}."
+            )
+            content_hash = hash_file_contents(image_paths[i]) if ocr_cache else None
+            content_hashes[i] = content_hash
+            ocr_result = _cached_ocr(content_hash, ocr_engine)
+            if ocr_result:
+                outcomes[i] = (ocr_result, f"{source_engine} (cached)")
+            elif ocr_engine == OCREngine.GOOGLE and not _reserve_gcv_call():
                 logger.warning(
-                    f"Found invalid/corrupt EXIF GPS for {filename}. "
-                    "Skipping OCR fallback as per user setting."
+                    f"Google Vision limit reached. Skipping OCR for {filename}."
                 )
+                outcomes[i] = (None, "")
             else:
-                # This entire block is now conditional on ocr_disabled being False
-                ocr_result = None
-                source_engine = ""
+                to_ocr.append((i, preprocessed))
 
-                logger.info(
-                    f"No valid EXIF GPS for {filename}. Attempting OCR with {ocr_engine.value}."
+        ocr_results = extract_gps_with_ocr_batch(
+            [image_paths[i] for i, _ in to_ocr],
+            ocr_engine,
+            gcv_key_path if ocr_engine == OCREngine.GOOGLE else None,
+            gcv_limiter=gcv_limiter,
+            preprocessed=(
+                [preprocessed for _, preprocessed in to_ocr]
+                if preprocess_for_ocr
+                else None
+            ),
+        )
+        for (i, _), ocr_result in zip(to_ocr, ocr_results):
+            _store_ocr_result(content_hashes[i], ocr_engine, ocr_result)
+            outcomes[i] = (ocr_result, source_engine)
+
+        for i, preprocessed in batch:
+            ocr_result, ocr_source = outcomes[i]
+            # Google Vision fallback if EasyOCR fails and fallback is enabled
+            if ocr_result is None and ocr_engine == OCREngine.EASYOCR and gcv_fallback:
+                ocr_result, ocr_source = _gcv_fallback(
+                    i, content_hashes[i], preprocessed
                 )
+            row = rows[i]
+            lat, lon, _, _ = _read_gps(row)
+            lat, lon = _apply_ocr_result(
+                image_files[i], row, lat, lon, ocr_result, ocr_source
+            )
+            _finalize_row(image_files[i], row, lat, lon)
 
-                use_gcv_primary = ocr_engine == OCREngine.GOOGLE
-                if use_gcv_primary:
-                    if gcv_limit == -1 or gcv_processed_count < gcv_limit:
-                        ocr_result = extract_gps_with_ocr(
-                            full_path,
-                            OCREngine.GOOGLE,
-                            gcv_key_path,
-                            preprocess_method=preprocess_method,
-                            debug_folder=debug_folder,
-                        )
-                        gcv_processed_count += 1
-                        source_engine = "Google Vision"
-                    else:
-                        logger.warning(
-                            f"Google Vision limit reached. Skipping OCR for {filename}."
-                        )
+    # Unchanged files get their EXIF values from the cache of earlier runs;
+    # only the others are read below.
+    exif_cache = ExifCache(schema) if use_cache else None
+    cached_exif = exif_cache.get_many(image_paths) if exif_cache else {}
+    if cached_exif:
+        logger.info(f"Reusing cached EXIF data for {len(cached_exif)} images.")
+    uncached_paths = [
+        path for i, path in enumerate(image_paths) if i not in cached_exif
+    ]
+    fresh_exif: List[Optional[Tuple[Any, ...]]] = []
+    rows: List[List[Any]] = []
+
+    def _iter_rows(exif_results: Iterator[Optional[Tuple[Any, ...]]]):
+        """
+        Yields (index, row) for every image as its EXIF values arrive, in
+        input order. GPS coordinates are converted from DMS to decimal degrees
+        a chunk of rows at a time, instead of once per image.
+        """
+        for chunk_start in range(0, len(image_paths), _EXIF_CHUNK_SIZE):
+            chunk = []
+            for i in range(
+                chunk_start, min(chunk_start + _EXIF_CHUNK_SIZE, len(image_paths))
+            ):
+                if i in cached_exif:
+                    values = cached_exif[i]
                 else:
-                    ocr_result = extract_gps_with_ocr(
-                        full_path,
-                        OCREngine.EASYOCR,
-                        None,
-                        preprocess_method=preprocess_method,
-                        debug_folder=debug_folder,
+                    values = next(exif_results)
+                    fresh_exif.append(values)
+                chunk.append([*(values or empty_exif), *padding])
+            _convert_gps_columns(chunk, gps_column_indices)
+            rows.extend(chunk)
+            yield from enumerate(chunk, chunk_start)
+
+    # The caches are saved and closed even if the run fails, so the images
+    # read so far need not be read again.
+    try:
+        # The images flow through three stages: EXIF reads (on a process pool
+        # for large folders), then a filter that finalizes the rows with usable
+        # GPS, then preprocessing and OCR of the rest. Each stage pulls from the
+        # previous one, so OCR starts as soon as the first candidates are
+        # known. Rows are updated in place and keep their order.
+        with contextlib.ExitStack() as stack:
+            needed_ids = build_needed_tag_ids(schema)
+            if len(uncached_paths) >= _EXIF_POOL_MIN_IMAGES:
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(
+                        # One worker per chunk at most.
+                        max_workers=min(
+                            os.cpu_count() or 1,
+                            math.ceil(len(uncached_paths) / _EXIF_CHUNK_SIZE),
+                        ),
+                        initializer=_init_exif_worker,
+                        initargs=(
+                            schema,
+                            needed_ids,
+                            get_log_queue(),
+                            logger.level,
+                        ),
+                    )
+                )
+                exif_results = executor.map(
+                    _extract_exif_in_worker,
+                    uncached_paths,
+                    chunksize=_EXIF_CHUNK_SIZE,
+                )
+            else:
+                # Starting the workers would take longer than reading these.
+                exif_results = (
+                    extract_exif_data(path, schema, needed_ids)
+                    for path in uncached_paths
+                )
+            if ocr_disabled:
+                for i, row in _iter_rows(exif_results):
+                    _process_without_ocr(image_files[i], row)
+            else:
+                # Importing the OCR module starts loading the EasyOCR models on a
+                # background thread. Doing so only once the workers have been
+                # started keeps that thread out of forked workers, and overlaps
+                # the loading with the EXIF pass.
+                from src.core.ocr import (
+                    EASYOCR_BATCH_SIZE,
+                    GCV_MAX_BATCH_SIZE,
+                    extract_gps_with_ocr,
+                    extract_gps_with_ocr_batch,
+                )
+                from src.core.preprocess import (
+                    preprocess_stage,
+                    start_preprocessing_threads,
+                )
+
+                ocr_indices: List[int] = []
+
+                def _ocr_candidates() -> Iterator[str]:
+                    """Finalizes rows that need no OCR; yields the other images."""
+                    for i, row in _iter_rows(exif_results):
+                        if _needs_ocr(row):
+                            ocr_indices.append(i)
+                            yield image_paths[i]
+                        else:
+                            _process_without_ocr(image_files[i], row)
+
+                def _preprocessed_candidates() -> (
+                    "Iterator[Tuple[int, PreprocessedImage]]"
+                ):
+                    """
+                    Yields the index and preprocessing result of each image that
+                    needs OCR. Images that fail to preprocess are not OCRed.
+                    """
+                    preprocessed_images = preprocess_stage(
+                        _ocr_candidates(), preprocess_method, debug_folder
                     )
-                    source_engine = "EasyOCR"
+                    # The k-th preprocessed image belongs to the k-th candidate.
+                    for k, preprocessed in enumerate(preprocessed_images):
+                        i = ocr_indices[k]
+                        if preprocessed is None:
+                            _skip_unpreprocessed(i)
+                        else:
+                            yield i, preprocessed
 
-                # Google Vision fallback if EasyOCR fails and fallback is enabled
-                if (
-                    ocr_result is None
-                    and ocr_engine == OCREngine.EASYOCR
-                    and gcv_fallback
+                def _ocr_batches() -> (
+                    "Iterator[List[Tuple[int, Optional[PreprocessedImage]]]]"
                 ):
-                    if gcv_limit == -1 or gcv_processed_count < gcv_limit:
-                        logger.info(
-                            f"EasyOCR failed for {filename}. Trying Google Vision fallback..."
-                        )
-                        ocr_result = extract_gps_with_ocr(
-                            full_path,
-                            OCREngine.GOOGLE,
-                            gcv_key_path,
-                            preprocess_method=preprocess_method,
-                            debug_folder=debug_folder,
-                        )
-                        gcv_processed_count += 1
-                        source_engine = "Google Vision (Fallback)"
+                    """Yields the images to OCR, in order, in batches."""
+                    if preprocess_for_ocr:
+                        start_preprocessing_threads()
+                        candidates = _preprocessed_candidates()
                     else:
-                        logger.warning(
-                            f"Google Vision limit reached. Skipping fallback for {filename}."
+                        candidates = (
+                            (ocr_indices[k], None)
+                            for k, _ in enumerate(_ocr_candidates())
                         )
-
-                if ocr_result:
-                    lat, lon, raw_text = ocr_result
-                    image_data["lat"], image_data["lon"] = lat, lon
-                    logger.info(
-                        f"Successfully extracted GPS via {source_engine} for {filename}. "
-                        f"Raw: '{raw_text}' -> Converted: ({lat:.6f}, {lon:.6f})"
+                    # Up to `GCV_MAX_BATCH_SIZE` images share a Google Vision
+                    # request.
+                    batch_size = (
+                        GCV_MAX_BATCH_SIZE
+                        if ocr_engine == OCREngine.GOOGLE
+                        else EASYOCR_BATCH_SIZE
                     )
-                else:
-                    logger.warning(f"All OCR attempts failed for {filename}.")
-        # --- END OF REFACTORED LOGIC ---
-
-        # Finalize Row Data
-        image_data["name"] = filename
-        if image_data.get("lat") is not None and image_data.get("lon") is not None:
-            lat, lon = image_data["lat"], image_data["lon"]
-            image_data["maps_url"] = (
-                f"https://www.google.com/maps/search/?api=1&query={lat},{lon}"
-            )
-        if include_full_path:
-            image_data["photo_path"] = os.path.abspath(full_path)
-        all_image_data.append(image_data)
+                    batch = []
+                    for candidate in candidates:
+                        batch.append(candidate)
+                        if len(batch) == batch_size:
+                            yield batch
+                            batch = []
+                    if batch:
+                        yield batch
+
+                # OCR time is spent in native code and network calls, which
+                # release the GIL, so the OCR stage runs on a thread pool.
+                # Google Vision requests are paced by `gcv_limiter` instead.
+                max_ocr_workers = os.cpu_count() or 1
+                if ocr_engine == OCREngine.EASYOCR:
+                    max_ocr_workers = min(max_ocr_workers, _EASYOCR_MAX_WORKERS)
+                with ThreadPoolExecutor(
+                    max_workers=max_ocr_workers, thread_name_prefix="ocr"
+                ) as ocr_executor:
+                    pending = deque()
+                    for batch in _ocr_batches():
+                        pending.append(ocr_executor.submit(_process_ocr_batch, batch))
+                        # Bound the number of images waiting for OCR.
+                        if len(pending) >= 2 * max_ocr_workers:
+                            pending.popleft().result()
+                    for future in pending:
+                        future.result()
 
-    # 3. Create DataFrame and save
-    if not all_image_data:
+    finally:
+        if exif_cache:
+            # `fresh_exif` lines up with the start of `uncached_paths`.
+            exif_cache.put_many(zip(uncached_paths, fresh_exif))
+            exif_cache.close()
+        if ocr_cache:
+            ocr_cache.close()
+
+    # 3. Save the rows
+    if not rows:
         logger.warning("No images processed. No output file will be created.")
         return
 
-    df = pd.DataFrame(all_image_data)
-    final_columns = list(tags_to_extract.keys())
+    final_columns = list(exif_columns)
     if "name" not in final_columns:
         final_columns.insert(0, "name")
     if "maps_url" not in final_columns:
         final_columns.append("maps_url")
     if include_full_path:
         final_columns.append("photo_path")
-    df = df.reindex(columns=final_columns)
 
-    output_folder, output_filename = os.path.split(output_file)
-    file_extension = os.path.splitext(output_filename)[1].lower()
+    # Rows are streamed in the final column order; no DataFrame is needed.
+    final_indices = [column_index[column] for column in final_columns]
+    final_rows = ([row[i] for i in final_indices] for row in rows)
 
     if file_extension == ".csv":
-        write_dataframe_to_csv(df, output_folder or ".", output_filename)
-    elif file_extension == ".xlsx":
-        write_dataframe_to_excel(df, output_folder or ".", output_filename)
+        write_rows_to_csv(final_rows, final_columns, output_folder, output_filename)
     else:
-        logger.error(
-            f"Unsupported output file format: '{file_extension}'. Please use '.csv' or '.xlsx'."
-        )
-        raise ValueError("Unsupported file format")
+        write_rows_to_excel(final_rows, final_columns, output_folder, output_filename)
 
     logger.info("--- GPS Extraction Workflow Completed ---")
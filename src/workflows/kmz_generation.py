@@ -5,29 +5,52 @@ from datetime import datetime
 
 import pandas as pd
 
-from src.core.kml import create_kml_file, create_kmz_archive
-from src.io.downloader import download_file, is_url
+from src.core.kml import (
+    COMPRESSED_MEDIA_EXTENSIONS,
+    create_kml_file,
+    create_kmz_archive,
+    render_descriptions,
+    template_field_names,
+)
+from src.io.downloader import URL_PREFIXES, download_files
+from src.io.reader import read_csv_file, read_excel_file
 from src.utils.config_loader import load_config
 
 logger = logging.getLogger("GeoPhotoToolkitLogger")
 
+# Columns the KMZ is built from, besides those used by the description template.
+_KMZ_COLUMNS = frozenset(
+    {"name", "lat", "lon", "latitude", "longitude", "photo_path", "icon_url"}
+)
+
+
+def _localize_media(paths: pd.Series, download_folder: str) -> pd.Series:
+    """
+    Downloads the URLs among `paths` into `download_folder`, concurrently.
+    Returns the local path of each download (None where it failed); other
+    values are kept.
+    """
+    is_remote = paths.notna() & paths.astype(str).str.startswith(URL_PREFIXES)
+    local_paths = paths.copy()
+    if is_remote.any():
+        # Results come back in the order of the URLs.
+        local_paths[is_remote] = download_files(
+            paths[is_remote].tolist(), download_folder
+        )
+    return local_paths
+
 
 def _process_media_links(df: pd.DataFrame, base_media_folder: str) -> pd.DataFrame:
-    # ... (This function does not need to change)
     df_processed = df.copy()
     photo_folder = os.path.join(base_media_folder, "photo_files")
     icon_folder = os.path.join(base_media_folder, "icon_files")
     if "photo_path" in df_processed.columns:
-        df_processed["local_photo_path"] = df_processed["photo_path"].apply(
-            lambda path: download_file(path, photo_folder)
-            if pd.notna(path) and is_url(path)
-            else path
+        df_processed["local_photo_path"] = _localize_media(
+            df_processed["photo_path"], photo_folder
         )
     if "icon_url" in df_processed.columns:
-        df_processed["local_icon_path"] = df_processed["icon_url"].apply(
-            lambda url: download_file(url, icon_folder)
-            if pd.notna(url) and is_url(url)
-            else url
+        df_processed["local_icon_path"] = _localize_media(
+            df_processed["icon_url"], icon_folder
         )
     return df_processed
 
@@ -59,21 +82,28 @@ def run_kmz_generation_workflow(
     if not os.path.exists(input_file):
         logger.error(f"Input file not found: {input_file}")
         return
+    # Only read the columns the KMZ uses; all of them if the template's
+    # fields cannot be determined.
+    if description_template:
+        template_fields = template_field_names(description_template)
+        columns = (
+            _KMZ_COLUMNS | template_fields if template_fields is not None else None
+        )
+    else:
+        columns = _KMZ_COLUMNS | {"description"}
     try:
         filename, extension = os.path.splitext(input_file)
         extension = extension.lower()
         if extension == ".csv":
-            df = pd.read_csv(input_file)
+            df = read_csv_file(input_file, columns)
         elif extension == ".xlsx":
-            df = pd.read_excel(input_file)
+            df = read_excel_file(input_file, columns)
         else:
             logger.error(
                 f"Unsupported file format: '{extension}'. Please use '.csv' or '.xlsx'."
             )
             return
 
-        # To handle potential NaN values from empty cells that break the formatter
-        df.fillna("", inplace=True)
         # We need a 'longitude' and 'latitude' column from the extraction step
         # Let's assume the config maps them as 'lon' and 'lat'
         df.rename(columns={"lon": "longitude", "lat": "latitude"}, inplace=True)
@@ -83,6 +113,24 @@ def run_kmz_generation_workflow(
                 "Input file must contain 'latitude' and 'longitude' columns (or 'lat'/'lon')."
             )
             return
+
+        # Rows without coordinates cannot be placed on the map.
+        has_coordinates = df["latitude"].notna() & df["longitude"].notna()
+        if not has_coordinates.all():
+            logger.warning(
+                f"Skipping {(~has_coordinates).sum()} rows without coordinates."
+            )
+            df = df.loc[has_coordinates]
+        # Empty cells would render as 'nan' in descriptions, so fill them with
+        # ''. Only columns with empty cells are touched; the coordinates keep
+        # their numeric dtype.
+        fill_columns = [
+            col
+            for col in df.columns
+            if col not in ("latitude", "longitude") and df[col].hasnans
+        ]
+        if fill_columns:
+            df[fill_columns] = df[fill_columns].astype(object).fillna("")
     except Exception as e:
         logger.error(f"Failed to read or validate input file: {e}")
         return
@@ -93,14 +141,29 @@ def run_kmz_generation_workflow(
     # 4. Create the KML file
     folder_name = os.path.basename(filename)
     temp_kml_path = os.path.join(output_dir, "doc.kml")
+    # Descriptions are rendered for all rows at once, when the template allows.
+    descriptions = (
+        render_descriptions(df_with_local_paths, description_template)
+        if description_template
+        else None
+    )
     create_kml_file(
-        df_with_local_paths, folder_name, temp_kml_path, description_template
+        df_with_local_paths,
+        folder_name,
+        temp_kml_path,
+        description_template,
+        descriptions,
     )
 
     # 5. Create the final KMZ archive
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
     output_kmz_filename = f"{folder_name}_{timestamp}.kmz"
     output_kmz_path = os.path.join(output_dir, output_kmz_filename)
-    create_kmz_archive(temp_kml_path, df_with_local_paths, output_kmz_path)
+    create_kmz_archive(
+        temp_kml_path,
+        df_with_local_paths,
+        output_kmz_path,
+        stored_extensions=COMPRESSED_MEDIA_EXTENSIONS,
+    )
 
     logger.info("KMZ generation workflow completed successfully.")